@@ -0,0 +1,98 @@
+"""
+Coût encode/décode d'un sondage selon le codec : ancien json indent=2,
+json stdlib compact, orjson (si installé), et VoteStore binaire pour
+les votes seuls.
+
+    python -m benchmarks.bench_codec
+    python -m benchmarks.bench_codec --voters 10 1000 50000
+"""
+import argparse
+import json
+import random
+import time
+
+from modules.polls.vote_store import VoteStore
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+OPTIONS = ["Oui", "Non", "Peut-être"]
+
+
+def gen_poll(voters, seed=42):
+    rnd = random.Random(seed)
+    votes = {
+        str(rnd.randrange(10**17, 10**18)): rnd.sample(OPTIONS, rnd.randint(1, 2))
+        for _ in range(voters)
+    }
+    return {
+        "poll_id": "bench",
+        "question": "Raid ce soir ?",
+        "options": OPTIONS,
+        "created_by": 1,
+        "created_at": "2026-01-01T00:00:00",
+        "status": "closed",
+        "multiple": True,
+        "ends_at": None,
+        "notify_roles": [],
+        "votes": votes
+    }
+
+
+def codecs():
+    yield "json indent=2", (
+        lambda o: json.dumps(o, indent=2, ensure_ascii=False).encode("utf-8"),
+        json.loads
+    )
+    yield "json compact", (
+        lambda o: json.dumps(o, separators=(",", ":"), ensure_ascii=False).encode("utf-8"),
+        json.loads
+    )
+    if orjson is not None:
+        yield "orjson", (orjson.dumps, orjson.loads)
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--voters", type=int, nargs="+", default=[10, 1000, 50000])
+    args = parser.parse_args()
+
+    print(f"{'votants':>8} {'codec':16} {'taille':>10} {'save':>10} {'load':>10}")
+
+    for voters in args.voters:
+        poll = gen_poll(voters)
+        repeat = 200 if voters <= 1000 else 5
+
+        for name, (encode, decode) in codecs():
+            save, blob = timed(lambda: encode(poll), repeat)
+            load, _ = timed(lambda: decode(blob), repeat)
+            print(
+                f"{voters:8} {name:16} {len(blob) / 1024:8.1f}Ko "
+                f"{save * 1000:8.3f}ms {load * 1000:8.3f}ms"
+            )
+
+        store = VoteStore.from_rows(OPTIONS, (
+            (uid, opt) for uid, opts in poll["votes"].items() for opt in opts
+        ))
+        save, blob = timed(store.to_bytes, repeat)
+        load, _ = timed(lambda: VoteStore.from_bytes(OPTIONS, blob), repeat)
+        print(
+            f"{voters:8} {'VoteStore (bin)':16} {len(blob) / 1024:8.1f}Ko "
+            f"{save * 1000:8.3f}ms {load * 1000:8.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Micro-benchmark votes/sec : connexion par appel (ancien polls_db)
+contre le SQLiteManager WAL + thread writer.
+
+    python -m benchmarks.bench_polls_db --votes 2000
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from core.db import SQLiteManager
+from modules.polls import polls_db
+
+
+def legacy_register_vote(path, poll_id, user_id, option):
+    conn = sqlite3.connect(path)
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            INSERT INTO votes (poll_id, user_id, option)
+            VALUES (?, ?, ?)
+        """, (poll_id, user_id, option))
+        conn.commit()
+        return True
+    except sqlite3.IntegrityError:
+        return False
+    finally:
+        conn.close()
+
+
+def bench_legacy(path, votes):
+    start = time.perf_counter()
+    for uid in range(votes):
+        legacy_register_vote(path, "bench", uid, "A")
+    return time.perf_counter() - start
+
+
+def bench_pooled_sync(db, votes):
+    start = time.perf_counter()
+    for uid in range(votes):
+        db.write_sync(polls_db._register_vote, "bench", uid, "A")
+    return time.perf_counter() - start
+
+
+def bench_pooled_submit(db, votes):
+    start = time.perf_counter()
+    futures = [
+        db.write(polls_db._register_vote, "bench", uid, "A")
+        for uid in range(votes)
+    ]
+    ack = time.perf_counter() - start
+    for f in futures:
+        f.result()
+    return ack, time.perf_counter() - start
+
+
+def fresh_db(tmp, name):
+    path = os.path.join(tmp, name)
+    db = SQLiteManager(path)
+    db.write_sync(polls_db._init_db)
+    return path, db
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--votes", type=int, default=2000)
+    args = parser.parse_args()
+    n = args.votes
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path, db = fresh_db(tmp, "legacy.db")
+        db.close()
+        # l'ancien code tournait en journal DELETE par défaut
+        sqlite3.connect(path).execute("PRAGMA journal_mode=DELETE").close()
+        legacy = bench_legacy(path, n)
+
+        _, db = fresh_db(tmp, "pooled_sync.db")
+        pooled = bench_pooled_sync(db, n)
+        db.close()
+
+        _, db = fresh_db(tmp, "pooled_submit.db")
+        ack, total = bench_pooled_submit(db, n)
+        db.close()
+
+    print(f"votes                 : {n}")
+    print(f"legacy (connect/call) : {n / legacy:10.0f} votes/s")
+    print(f"pooled write_sync     : {n / pooled:10.0f} votes/s")
+    print(f"pooled submit (ack)   : {n / ack:10.0f} votes/s")
+    print(f"pooled submit (commit): {n / total:10.0f} votes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Mémoire et sérialisation des votes : ancien dict {str(uid): [labels]}
+contre le VoteStore compact (arrays + bitmasks).
+
+    python -m benchmarks.bench_vote_store --voters 50000
+"""
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+from modules.polls.vote_store import VoteStore
+
+OPTIONS = ["Oui", "Non", "Peut-être", "Plus tard", "Sans avis"]
+
+
+def gen_rows(voters, seed=42):
+    rnd = random.Random(seed)
+    rows = []
+    for _ in range(voters):
+        uid = rnd.randrange(10**17, 10**18)  # ordre de grandeur d'un snowflake
+        for opt in rnd.sample(OPTIONS, rnd.randint(1, 3)):
+            rows.append((uid, opt))
+    return rows
+
+
+def build_legacy(rows):
+    votes = {}
+    for uid, opt in rows:
+        votes.setdefault(str(uid), []).append(opt)
+    return votes
+
+
+def measure(build, rows):
+    tracemalloc.start()
+    obj = build(rows)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--voters", type=int, default=50000)
+    args = parser.parse_args()
+
+    rows = gen_rows(args.voters)
+
+    legacy, legacy_mem = measure(build_legacy, rows)
+    store, store_mem = measure(lambda r: VoteStore.from_rows(OPTIONS, r), rows)
+
+    legacy_dump, legacy_blob = timed(lambda: json.dumps(legacy, ensure_ascii=False))
+    store_dump, store_blob = timed(store.to_bytes)
+    legacy_load, _ = timed(lambda: json.loads(legacy_blob))
+    store_load, _ = timed(lambda: VoteStore.from_bytes(OPTIONS, store_blob))
+
+    print(f"{args.voters} votants, {len(rows)} votes")
+    print(f"{'':10} {'mémoire':>12} {'taille':>12} {'dump':>10} {'load':>10}")
+    print(
+        f"{'dict':10} {legacy_mem / 1024:10.0f}Ko {len(legacy_blob) / 1024:10.0f}Ko "
+        f"{legacy_dump * 1000:8.2f}ms {legacy_load * 1000:8.2f}ms"
+    )
+    print(
+        f"{'VoteStore':10} {store_mem / 1024:10.0f}Ko {len(store_blob) / 1024:10.0f}Ko "
+        f"{store_dump * 1000:8.2f}ms {store_load * 1000:8.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
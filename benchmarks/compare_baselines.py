@@ -0,0 +1,75 @@
+"""
+Compare deux exports JSON de pytest-benchmark (--benchmark-json) et
+signale les régressions de médiane au-delà d'un seuil.
+
+    python -m benchmarks.compare_baselines benchmarks/baselines/baseline.json \\
+        current.json --threshold 15
+
+Code de sortie 1 si au moins une régression dépasse le seuil.
+"""
+import argparse
+import json
+import sys
+
+
+def load_medians(path: str, stat: str) -> dict[str, float]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {
+        bench["fullname"]: bench["stats"][stat]
+        for bench in data.get("benchmarks", [])
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[tuple]:
+    """
+    [(nom, avant, après, écart %, régression)] pour les benchmarks communs.
+    """
+    rows = []
+    for name in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[name], current[name]
+        delta = (after - before) / before * 100 if before else 0.0
+        rows.append((name, before, after, delta, delta > threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument(
+        "--threshold", type=float, default=10,
+        help="régression tolérée en %% (défaut 10)"
+    )
+    parser.add_argument(
+        "--stat", default="median", choices=["min", "median", "mean"]
+    )
+    args = parser.parse_args()
+
+    baseline = load_medians(args.baseline, args.stat)
+    current = load_medians(args.current, args.stat)
+    rows = compare(baseline, current, args.threshold)
+
+    width = max((len(name) for name, *_ in rows), default=10)
+    for name, before, after, delta, regressed in rows:
+        flag = "  ⚠️ RÉGRESSION" if regressed else ""
+        print(
+            f"{name:{width}} {before * 1e6:12.1f}µs → {after * 1e6:12.1f}µs "
+            f"{delta:+7.1f}%{flag}"
+        )
+
+    for name in sorted(baseline.keys() - current.keys()):
+        print(f"{name:{width}} absent du run courant")
+    for name in sorted(current.keys() - baseline.keys()):
+        print(f"{name:{width}} nouveau (pas de référence)")
+
+    regressions = [row for row in rows if row[4]]
+    print(
+        f"\n{len(rows)} comparé(s), {len(regressions)} régression(s) "
+        f"> {args.threshold:g}% ({args.stat})"
+    )
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
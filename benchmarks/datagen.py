@@ -0,0 +1,92 @@
+"""
+Générateurs de données synthétiques pour les benchmarks : sondages de
+10 à 50k votants, serveurs de 100 à 50k membres. Déterministes (seed).
+"""
+import random
+
+from benchmarks.fake_discord import FakeClient, populate_guild
+
+OPTIONS = ["Oui", "Non", "Peut-être", "Plus tard"]
+
+POLL_SIZES = [10, 1000, 10000, 50000]
+GUILD_SIZES = [100, 5000, 50000]
+
+
+def gen_votes(voters: int, options=OPTIONS, multiple: bool = True, seed: int = 42) -> dict:
+    """
+    {str(user_id): [options]} — format d'import (polls_db.import_poll)
+    """
+    rnd = random.Random(seed)
+    user_ids = rnd.sample(range(10**17, 10**17 + voters * 10), voters)
+    most = 2 if multiple else 1
+    return {
+        str(uid): rnd.sample(options, rnd.randint(1, most))
+        for uid in user_ids
+    }
+
+
+def gen_poll(
+    voters: int,
+    poll_id: str | None = None,
+    options=OPTIONS,
+    multiple: bool = True,
+    notify_roles=None,
+    seed: int = 42
+) -> dict:
+    """
+    Sondage ouvert au format dict, votes en {user_id: [options]}.
+    """
+    return {
+        "poll_id": poll_id or f"bench{voters}",
+        "guild_id": None,
+        "channel_id": 1,
+        "message_id": 2,
+        "question": f"Sondage de {voters} votants ?",
+        "options": list(options),
+        "created_by": 1,
+        "created_at": "2026-01-01T00:00:00",
+        "status": "open",
+        "ends_at": None,
+        "alert_sent": False,
+        "multiple": multiple,
+        "duration_minutes": 0,
+        "notify_roles": list(notify_roles or []),
+        "last_notify_ts": 0,
+        "votes": gen_votes(voters, options, multiple, seed)
+    }
+
+
+def with_vote_store(poll: dict) -> dict:
+    """
+    Copie du sondage avec les votes en VoteStore (forme résidente).
+    """
+    from modules.polls.vote_store import VoteStore
+
+    resident = dict(poll)
+    resident["votes"] = VoteStore.from_rows(poll["options"], (
+        (int(uid), opt)
+        for uid, opts in poll["votes"].items()
+        for opt in opts
+    ))
+    return resident
+
+
+def gen_guild(members: int, roles: int = 5, seed: int = 42):
+    """
+    (client, guild) : serveur factice de `members` membres sur `roles` rôles.
+    """
+    client = FakeClient()
+    return client, populate_guild(client, members, roles, seed)
+
+
+def gen_guild_poll(guild, turnout: float = 0.5, seed: int = 42) -> dict:
+    """
+    Sondage ciblant tous les rôles du serveur, voté par `turnout` des membres.
+    """
+    rnd = random.Random(seed)
+    members = guild.members
+    voters = rnd.sample(members, int(len(members) * turnout))
+
+    poll = gen_poll(0, f"guild{len(members)}", notify_roles=[r.id for r in guild.roles])
+    poll["votes"] = {str(m.id): [rnd.choice(OPTIONS)] for m in voters}
+    return poll
@@ -0,0 +1,351 @@
+"""
+Doublure hors-ligne des objets Discord manipulés par le module polls :
+Client, Guild, Member, Role, Interaction, Message, salons.
+
+Aucun gateway, aucun réseau : chaque appel « REST » passe par FakeHTTP,
+qui simule une latence et des 429 (bucket par route, retry-after puis
+nouvel essai, comme le fait discord.py) et compte les appels par route.
+
+Les classes de discord.py elles-mêmes (ui.View, DynamicItem, Embed…)
+restent les vraies : seuls les objets d'exécution sont simulés.
+"""
+import asyncio
+import itertools
+import random
+import time
+from collections import Counter
+
+_ids = itertools.count(10**17)
+
+
+def snowflake() -> int:
+    return next(_ids)
+
+
+# =========================
+# HTTP
+# =========================
+class FakeHTTP:
+    """
+    latency_ms / jitter_ms : durée d'un appel REST simulé.
+    rate_limit : (requêtes, fenêtre en secondes) par route, ou None.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 40,
+        jitter_ms: float = 20,
+        rate_limit: tuple[int, float] | None = (50, 1.0),
+        seed: int = 0
+    ):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.rate_limit = rate_limit
+        self.rnd = random.Random(seed)
+
+        self.calls = Counter()        # (méthode, route) -> appels aboutis
+        self.rate_limited = Counter() # (méthode, route) -> 429 reçus
+        self._windows: dict[str, list] = {}
+
+    def _bucket_wait(self, bucket: str) -> float:
+        if not self.rate_limit:
+            return 0.0
+
+        limit, per = self.rate_limit
+        now = time.monotonic()
+        window = self._windows.setdefault(bucket, [now, 0])
+
+        if now - window[0] >= per:
+            window[0], window[1] = now, 0
+
+        if window[1] < limit:
+            window[1] += 1
+            return 0.0
+
+        return window[0] + per - now
+
+    async def request(self, method: str, route: str, bucket: str | None = None):
+        key = (method, route)
+
+        while True:
+            retry_after = self._bucket_wait(bucket or route)
+            if retry_after <= 0:
+                break
+            self.rate_limited[key] += 1
+            await asyncio.sleep(retry_after)
+
+        await asyncio.sleep(max(0.0, self.rnd.gauss(self.latency, self.jitter)))
+        self.calls[key] += 1
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    @property
+    def total_429(self) -> int:
+        return sum(self.rate_limited.values())
+
+
+# =========================
+# GUILD / MEMBRES
+# =========================
+class FakeRole:
+    def __init__(self, role_id: int, name: str = "role"):
+        self.id = role_id
+        self.name = name
+        self.mention = f"<@&{role_id}>"
+
+
+class FakeUser:
+    def __init__(self, client, user_id: int, name: str | None = None):
+        self._client = client
+        self.id = user_id
+        self.name = name or f"user{user_id}"
+        self.display_name = self.name
+        self.mention = f"<@{user_id}>"
+        self.bot = False
+
+    async def send(self, content=None, **kwargs):
+        http = self._client.http
+        await http.request("POST", "/users/@me/channels")
+        await http.request(
+            "POST", "/channels/{channel_id}/messages", f"dm:{self.id}"
+        )
+        return FakeMessage(self._client, snowflake(), snowflake(), content)
+
+
+class FakeMember(FakeUser):
+    def __init__(self, client, guild, user_id: int, roles: list[FakeRole]):
+        super().__init__(client, user_id)
+        self.guild = guild
+        self.roles = roles
+
+
+class FakeGuild:
+    def __init__(self, client, guild_id: int, name: str = "Serveur de test"):
+        self._client = client
+        self.id = guild_id
+        self.name = name
+        self._members: dict[int, FakeMember] = {}
+        self._roles: dict[int, FakeRole] = {}
+
+    @property
+    def members(self):
+        return list(self._members.values())
+
+    @property
+    def roles(self):
+        return list(self._roles.values())
+
+    @property
+    def member_count(self):
+        return len(self._members)
+
+    def add_role(self, role: FakeRole):
+        self._roles[role.id] = role
+        return role
+
+    def add_member(self, member: FakeMember):
+        self._members[member.id] = member
+        return member
+
+    def get_member(self, user_id: int):
+        return self._members.get(user_id)
+
+    def get_role(self, role_id: int):
+        return self._roles.get(role_id)
+
+    async def fetch_members(self, limit=None):
+        # pagination REST de 1000 membres
+        members = self.members
+        for start in range(0, len(members), 1000):
+            await self._client.http.request("GET", "/guilds/{guild_id}/members")
+            for member in members[start:start + 1000]:
+                yield member
+
+
+# =========================
+# SALONS / MESSAGES
+# =========================
+class FakeMessage:
+    def __init__(self, client, message_id: int, channel_id: int, content=None):
+        self._client = client
+        self.id = message_id
+        self.channel = client.get_partial_messageable(channel_id)
+        self.content = content
+        self.embed = None
+
+    async def edit(self, **kwargs):
+        await self._client.http.request(
+            "PATCH",
+            "/channels/{channel_id}/messages/{message_id}",
+            f"channel:{self.channel.id}"
+        )
+        self.content = kwargs.get("content", self.content)
+        self.embed = kwargs.get("embed", self.embed)
+        return self
+
+
+class FakeChannel:
+    def __init__(self, client, channel_id: int):
+        self._client = client
+        self.id = channel_id
+        self.sent: list[str] = []
+
+    async def send(self, content=None, **kwargs):
+        await self._client.http.request(
+            "POST", "/channels/{channel_id}/messages", f"channel:{self.id}"
+        )
+        self.sent.append(content)
+        return FakeMessage(self._client, snowflake(), self.id, content)
+
+    def get_partial_message(self, message_id: int):
+        return FakeMessage(self._client, message_id, self.id)
+
+
+# =========================
+# INTERACTIONS
+# =========================
+class FakeResponse:
+    def __init__(self, interaction):
+        self._interaction = interaction
+        self._done = False
+        self.acked_at: float | None = None
+        self.messages: list = []
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def _callback(self):
+        if self._done:
+            raise RuntimeError("interaction déjà acquittée")
+        self._done = True
+        i = self._interaction
+        await i.client.http.request(
+            "POST",
+            "/interactions/{interaction_id}/{interaction_token}/callback",
+            f"interaction:{i.id}"
+        )
+        self.acked_at = time.perf_counter()
+
+    async def send_message(self, content=None, **kwargs):
+        await self._callback()
+        self.messages.append(content)
+
+    async def defer(self, **kwargs):
+        await self._callback()
+
+    async def send_modal(self, modal):
+        await self._callback()
+        self.messages.append(modal)
+
+    async def edit_message(self, **kwargs):
+        await self._callback()
+
+
+class FakeFollowup:
+    def __init__(self, interaction):
+        self._interaction = interaction
+
+    async def send(self, content=None, **kwargs):
+        i = self._interaction
+        await i.client.http.request(
+            "POST", "/webhooks/{application_id}/{interaction_token}",
+            f"interaction:{i.id}"
+        )
+        return FakeMessage(i.client, snowflake(), i.channel.id, content)
+
+
+class FakeInteraction:
+    def __init__(self, client, guild: FakeGuild, user: FakeMember, channel: FakeChannel):
+        self.id = snowflake()
+        self.client = client
+        self.guild = guild
+        self.user = user
+        self.channel = channel
+        self.created_at = time.perf_counter()
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+
+    async def original_response(self):
+        await self.client.http.request(
+            "GET", "/webhooks/{application_id}/{interaction_token}/messages/@original"
+        )
+        return FakeMessage(self.client, snowflake(), self.channel.id)
+
+    async def edit_original_response(self, **kwargs):
+        await self.client.http.request(
+            "PATCH", "/webhooks/{application_id}/{interaction_token}/messages/@original",
+            f"interaction:{self.id}"
+        )
+
+
+# =========================
+# CLIENT
+# =========================
+class FakeClient:
+    def __init__(self, http: FakeHTTP | None = None):
+        self.http = http or FakeHTTP()
+        self.user = FakeUser(self, snowflake(), "PollBot")
+        self._guilds: dict[int, FakeGuild] = {}
+        self._channels: dict[int, FakeChannel] = {}
+        self._users: dict[int, FakeUser] = {}
+
+    @property
+    def guilds(self):
+        return list(self._guilds.values())
+
+    def add_guild(self, guild_id: int | None = None) -> FakeGuild:
+        guild = FakeGuild(self, guild_id or snowflake())
+        self._guilds[guild.id] = guild
+        return guild
+
+    def get_guild(self, guild_id: int):
+        return self._guilds.get(guild_id)
+
+    def get_channel(self, channel_id: int):
+        return self.get_partial_messageable(channel_id)
+
+    def get_partial_messageable(self, channel_id: int):
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            channel = self._channels[channel_id] = FakeChannel(self, channel_id)
+        return channel
+
+    def get_user(self, user_id: int):
+        return self._users.get(user_id) or self._member(user_id)
+
+    async def fetch_user(self, user_id: int):
+        await self.http.request("GET", "/users/{user_id}")
+        user = self._users[user_id] = FakeUser(self, user_id)
+        return user
+
+    def _member(self, user_id: int):
+        for guild in self._guilds.values():
+            member = guild.get_member(user_id)
+            if member:
+                return member
+        return None
+
+    def add_dynamic_items(self, *items):
+        self.dynamic_items = items
+
+
+def populate_guild(
+    client: FakeClient,
+    members: int,
+    roles: int = 3,
+    seed: int = 0
+) -> FakeGuild:
+    """
+    Guild synthétique : `roles` rôles, chaque membre en porte 1 ou 2.
+    """
+    rnd = random.Random(seed)
+    guild = client.add_guild()
+    role_list = [guild.add_role(FakeRole(snowflake(), f"role{i}")) for i in range(roles)]
+
+    for _ in range(members):
+        picked = rnd.sample(role_list, min(len(role_list), rnd.randint(1, 2)))
+        guild.add_member(FakeMember(client, guild, snowflake(), picked))
+
+    return guild
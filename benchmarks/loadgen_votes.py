@@ -0,0 +1,164 @@
+"""
+Générateur de charge hors-ligne : N votants cliquent en parallèle sur les
+PollButton de M sondages, contre la doublure Discord de fake_discord.
+
+Le vrai chemin de vote est exercé (PollButton.callback → register_vote →
+VotePipeline → SQLite, puis EmbedRefresher → édition du message), dans
+une base temporaire. Rapporte débit, latence d'acquittement p50/p99 et
+appels REST par route (dont 429 simulés).
+
+    python -m benchmarks.loadgen_votes
+    python -m benchmarks.loadgen_votes --voters 2000 --polls 10 --clicks 5
+    python -m benchmarks.loadgen_votes --latency-ms 80 --rate-limit 5 5
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+from core import db as core_db
+from benchmarks.fake_discord import (
+    FakeClient,
+    FakeHTTP,
+    FakeInteraction,
+    populate_guild,
+    snowflake
+)
+
+OPTIONS = ["Oui", "Non", "Peut-être"]
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def create_polls(client, count: int, multiple: bool) -> list[tuple[str, int]]:
+    from modules.polls.manager import create_poll, generate_poll_id
+    from modules.polls.storage import save_poll
+
+    polls = []
+    for i in range(count):
+        poll = create_poll(
+            generate_poll_id(),
+            f"Sondage de charge #{i}",
+            OPTIONS,
+            client.user.id,
+            multiple,
+            0,
+            []
+        )
+        poll["channel_id"] = snowflake()
+        poll["message_id"] = snowflake()
+        save_poll(poll)
+        polls.append((poll["poll_id"], poll["channel_id"]))
+    return polls
+
+
+async def voter(client, guild, member, polls, clicks, think_ms, rnd, acks):
+    from modules.polls.ui import PollButton
+
+    for _ in range(clicks):
+        if think_ms:
+            await asyncio.sleep(rnd.uniform(0, think_ms) / 1000)
+
+        poll_id, channel_id = rnd.choice(polls)
+        interaction = FakeInteraction(
+            client, guild, member, client.get_partial_messageable(channel_id)
+        )
+        await PollButton(poll_id, rnd.choice(OPTIONS)).callback(interaction)
+
+        if interaction.response.acked_at is not None:
+            acks.append(interaction.response.acked_at - interaction.created_at)
+
+
+async def run(args):
+    from modules.polls import polls_db
+    from modules.polls.refresh import REFRESHER
+    from modules.polls.storage import flush_polls_async
+    from modules.polls.vote_pipeline import PIPELINE
+
+    http = FakeHTTP(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit=tuple(args.rate_limit) if args.rate_limit[0] > 0 else None,
+        seed=args.seed
+    )
+    client = FakeClient(http)
+    guild = populate_guild(client, args.voters, seed=args.seed)
+
+    polls_db.init_db()
+    polls = create_polls(client, args.polls, args.multiple)
+    REFRESHER.window = args.refresh_seconds
+    PIPELINE.start(args.batch_ms, args.batch_size)
+
+    rnd = random.Random(args.seed)
+    acks: list[float] = []
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        voter(client, guild, member, polls, args.clicks, args.think_ms,
+              random.Random(rnd.random()), acks)
+        for member in guild.members
+    ))
+    elapsed = time.perf_counter() - start
+
+    # drain : écritures de votes, éditions d'embed, cache
+    await PIPELINE.stop()
+    while REFRESHER._tasks:
+        await asyncio.gather(*list(REFRESHER._tasks.values()))
+    await flush_polls_async()
+    polls_db.DB.close()
+
+    return elapsed, acks, http
+
+
+def report(args, elapsed, acks, http):
+    clicks = args.voters * args.clicks
+
+    print(f"votants × clics        : {args.voters} × {args.clicks} sur {args.polls} sondage(s)")
+    print(f"durée                  : {elapsed:10.2f}s")
+    print(f"débit                  : {clicks / elapsed:10.0f} clics/s")
+    print(f"ack p50 / p99          : {percentile(acks, 0.5) * 1000:8.1f}ms / "
+          f"{percentile(acks, 0.99) * 1000:.1f}ms")
+    print(f"appels REST            : {http.total_calls:10}  (429 : {http.total_429})")
+
+    for (method, route), count in http.calls.most_common():
+        limited = http.rate_limited.get((method, route), 0)
+        print(f"  {method:6} {route:60} {count:8}  429={limited}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--voters", type=int, default=500)
+    parser.add_argument("--polls", type=int, default=5)
+    parser.add_argument("--clicks", type=int, default=3, help="clics par votant")
+    parser.add_argument("--think-ms", type=float, default=200)
+    parser.add_argument("--multiple", action="store_true")
+    parser.add_argument("--latency-ms", type=float, default=40)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument(
+        "--rate-limit", type=float, nargs=2, default=[5, 5],
+        metavar=("REQ", "SECONDES"),
+        help="bucket par route (0 0 pour désactiver)"
+    )
+    parser.add_argument("--refresh-seconds", type=float, default=2)
+    parser.add_argument("--batch-ms", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    args.rate_limit = (int(args.rate_limit[0]), args.rate_limit[1])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # base SQLite jetable : à fixer avant l'import de polls_db
+        core_db.DATA_DIR = tmp
+        elapsed, acks, http = asyncio.run(run(args))
+
+    report(args, elapsed, acks, http)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Suite pytest-benchmark des chemins chauds du module polls.
+
+    python -m pytest benchmarks/suite --benchmark-json=current.json
+    python -m benchmarks.compare_baselines benchmarks/baselines/baseline.json current.json
+
+Nouvelle référence : même commande avec
+--benchmark-json=benchmarks/baselines/baseline.json, sur la machine cible.
+
+Base SQLite et archives dans un dossier temporaire : rien n'est écrit
+dans data/.
+"""
+import asyncio
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from core import db as core_db
+
+# à fixer avant tout import de polls_db (DB créée à l'import)
+_TMP = tempfile.mkdtemp(prefix="pollbench-")
+core_db.DATA_DIR = _TMP
+
+from benchmarks import datagen  # noqa: E402
+from modules.polls import manager, polls_db  # noqa: E402
+from modules.polls.vote_pipeline import PIPELINE  # noqa: E402
+
+manager.ARCHIVE_DIR = os.path.join(_TMP, "archive")
+os.makedirs(manager.ARCHIVE_DIR, exist_ok=True)
+
+
+@pytest.fixture(scope="session")
+def loop():
+    loop = asyncio.new_event_loop()
+    polls_db.init_db()
+
+    async def start():
+        PIPELINE.start()
+
+    loop.run_until_complete(start())
+    yield loop
+
+    loop.run_until_complete(PIPELINE.stop())
+    loop.close()
+    polls_db.DB.close()
+    shutil.rmtree(_TMP, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def seeded_polls(loop):
+    """
+    {votants: sondage} importés en base, une fois par session.
+    """
+    polls = {}
+    for size in datagen.POLL_SIZES:
+        poll = datagen.gen_poll(size)
+        polls_db.import_poll(poll)
+        polls[size] = poll
+    return polls
+
+
+@pytest.fixture(scope="session")
+def guilds():
+    """
+    {membres: (client, guild)}
+    """
+    return {size: datagen.gen_guild(size) for size in datagen.GUILD_SIZES}
+
+
+def pytest_benchmark_update_json(config, benchmarks, output_json):
+    # références versionnées : statistiques seules, pas chaque mesure
+    for bench in output_json["benchmarks"]:
+        bench["stats"].pop("data", None)
@@ -0,0 +1,15 @@
+import sys
+
+import pytest
+
+from benchmarks.torture_atomic_write import torture
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="SIGKILL requis")
+@pytest.mark.parametrize("mode", ["atomic", "batched"])
+def test_atomic_write_survives_kill(mode):
+    # version courte de benchmarks.torture_atomic_write : quelques SIGKILL
+    # en pleine écriture, aucun fichier ne doit se relire corrompu
+    totals = torture(mode, rounds=4, seed=1)
+    assert totals["ok"] > 0
+    assert totals["corrupted"] == 0
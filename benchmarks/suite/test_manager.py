@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from benchmarks.datagen import POLL_SIZES, gen_poll
+from modules.polls import manager, polls_db, storage
+from modules.polls.vote_pipeline import PIPELINE
+
+
+@pytest.mark.parametrize("voters", POLL_SIZES)
+def test_register_vote(benchmark, loop, voters):
+    # copie dédiée : les sondages de référence gardent leur nombre de votants
+    poll_id = f"click{voters}"
+    polls_db.import_poll(gen_poll(voters, poll_id))
+    storage.load_poll(poll_id)
+    # sondage multiple : le même clic ajoute puis retire → taille stable
+    user_id = 10**17 + voters * 5 + 1
+
+    def click():
+        return loop.run_until_complete(
+            manager.register_vote(poll_id, user_id, "Oui")
+        )
+
+    _, status, _ = benchmark(click)
+    assert status == "ok"
+
+
+@pytest.mark.parametrize("voters", POLL_SIZES)
+def test_compute_results(benchmark, seeded_polls, voters):
+    poll = storage.load_poll(seeded_polls[voters]["poll_id"])
+
+    results = benchmark(manager.compute_results, poll)
+    assert set(results) == set(poll["options"])
+
+
+def test_single_choice_after_multi_clears_db(loop):
+    # A et B en multi, repassage en choix unique, clic sur A : B doit
+    # disparaître aussi en base, pas seulement dans le VoteStore
+    poll_id = "multi_to_single"
+    polls_db.import_poll(gen_poll(0, poll_id))
+    storage.load_poll(poll_id)
+
+    async def scenario():
+        await manager.register_vote(poll_id, 42, "Oui")
+        await manager.register_vote(poll_id, 42, "Non")
+        async with storage.poll_transaction(poll_id) as poll:
+            poll["multiple"] = False
+        await manager.register_vote(poll_id, 42, "Oui")
+        # laisse passer le group commit
+        await asyncio.sleep(PIPELINE.batch_ms / 1000 * 4)
+
+    loop.run_until_complete(scenario())
+    polls_db.DB.write_sync(lambda conn: None)
+
+    assert storage.load_poll(poll_id)["votes"].options_of(42) == ["Oui"]
+    assert polls_db.get_votes(poll_id) == {"Oui": [42]}
+
+
+def test_close_evicts_poll(loop, guilds):
+    pytest.importorskip("discord")
+    from benchmarks.datagen import gen_guild_poll
+    from modules.polls.scheduler import close_poll_and_process
+
+    client, guild = guilds[100]
+    poll = gen_guild_poll(guild)
+    poll["poll_id"] = "close_evicts"
+    poll["guild_id"] = guild.id
+    polls_db.import_poll(poll)
+    storage.load_poll("close_evicts")
+
+    loop.run_until_complete(close_poll_and_process(client, "close_evicts", "manual"))
+
+    # archivé : plus résident, le refresh final ne l'a pas rechargé
+    assert "close_evicts" not in storage._CACHE
+    assert polls_db.get_poll("close_evicts")["status"] == "closed"
@@ -0,0 +1,64 @@
+import itertools
+
+import pytest
+
+from benchmarks.datagen import GUILD_SIZES, gen_guild_poll, with_vote_store
+from modules.polls import non_voters
+from modules.polls.absentees import ABSENTEES, find_missing_voters
+from modules.polls.role_index import ROLE_INDEX
+
+_closes = itertools.count()
+
+
+@pytest.mark.parametrize("members", GUILD_SIZES)
+def test_register_missed_votes(benchmark, loop, guilds, members):
+    _, guild = guilds[members]
+    absent = guild.members[: members // 2]
+
+    def close():
+        # un poll_id neuf par tour : INSERT OR IGNORE ne saute rien
+        non_voters.register_missed_votes(absent, guild, f"closed{members}-{next(_closes)}")
+
+    benchmark.pedantic(close, rounds=5)
+
+
+@pytest.mark.parametrize("members", GUILD_SIZES)
+def test_role_index_build(benchmark, guilds, members):
+    _, guild = guilds[members]
+    benchmark(ROLE_INDEX.build, guild)
+
+
+@pytest.mark.parametrize("members", GUILD_SIZES)
+def test_find_missing_voters(benchmark, guilds, members):
+    _, guild = guilds[members]
+    poll = with_vote_store(gen_guild_poll(guild))
+    ROLE_INDEX.build(guild)
+
+    def compute():
+        # snapshot jeté à chaque tour : on mesure le calcul, pas le cache
+        ABSENTEES.drop(poll["poll_id"])
+        return find_missing_voters(guild, poll)
+
+    missing = benchmark(compute)
+    assert len(missing) == members - poll["votes"].voter_count
+
+
+@pytest.mark.parametrize("members", GUILD_SIZES)
+def test_absentee_snapshot_hit(benchmark, guilds, members):
+    # même version de votes et d'index : snapshot partagé, pas de recalcul
+    _, guild = guilds[members]
+    poll = with_vote_store(gen_guild_poll(guild))
+    first = ABSENTEES.get(guild, poll)
+
+    assert benchmark(ABSENTEES.get, guild, poll) is first
+
+
+def test_absentee_snapshot_per_roles(guilds):
+    # /poll_status avec des rôles de repli n'évince pas le snapshot du sondage
+    _, guild = guilds[GUILD_SIZES[0]]
+    poll = with_vote_store(gen_guild_poll(guild))
+    own = ABSENTEES.get(guild, poll)
+    fallback = ABSENTEES.get(guild, poll, [guild.roles[0].id])
+
+    assert fallback is not own
+    assert ABSENTEES.get(guild, poll) is own
@@ -0,0 +1,113 @@
+import itertools
+
+import pytest
+
+from benchmarks.datagen import POLL_SIZES, gen_poll
+from modules.polls import polls_db
+
+_uids = itertools.count(1)
+
+
+@pytest.fixture(scope="module")
+def write_poll(loop):
+    # sondage dédié aux écritures : les sondages de référence gardent
+    # leur nombre de votants
+    poll = gen_poll(0, "writes")
+    polls_db.import_poll(poll)
+    return poll["poll_id"]
+
+
+def test_init_db(benchmark, loop):
+    benchmark(polls_db.init_db)
+
+
+def test_save_polls(benchmark, seeded_polls):
+    rows = [
+        polls_db.poll_row(dict(gen_poll(0, f"meta{i}"), votes={}))
+        for i in range(100)
+    ]
+    benchmark(polls_db.save_polls, rows)
+
+
+@pytest.mark.parametrize("voters", POLL_SIZES)
+def test_import_poll(benchmark, loop, voters):
+    poll = gen_poll(voters, f"import{voters}")
+    benchmark.pedantic(polls_db.import_poll, args=(poll,), rounds=5)
+
+
+@pytest.mark.parametrize("voters", POLL_SIZES)
+def test_get_poll(benchmark, seeded_polls, voters):
+    assert benchmark(polls_db.get_poll, seeded_polls[voters]["poll_id"])
+
+
+@pytest.mark.parametrize("voters", POLL_SIZES)
+def test_get_votes(benchmark, seeded_polls, voters):
+    benchmark(polls_db.get_votes, seeded_polls[voters]["poll_id"])
+
+
+@pytest.mark.parametrize("voters", POLL_SIZES)
+def test_get_vote_store(benchmark, seeded_polls, voters):
+    poll = seeded_polls[voters]
+    store = benchmark(polls_db.get_vote_store, poll["poll_id"], poll["options"])
+    assert store.voter_count == voters
+
+
+@pytest.mark.parametrize("voters", POLL_SIZES)
+def test_count_votes(benchmark, seeded_polls, voters):
+    benchmark(polls_db.count_votes, seeded_polls[voters]["poll_id"])
+
+
+def test_register_vote(benchmark, write_poll):
+    benchmark(lambda: polls_db.register_vote(write_poll, next(_uids), "Oui"))
+
+
+def test_remove_vote(benchmark, write_poll):
+    def setup():
+        uid = next(_uids)
+        polls_db.register_vote(write_poll, uid, "Non")
+        return (write_poll, uid, "Non"), {}
+
+    benchmark.pedantic(polls_db.remove_vote, setup=setup, rounds=200)
+
+
+def test_submit_vote(benchmark, write_poll):
+    # acquittement seul : l'écriture part sur le thread writer
+    benchmark(lambda: polls_db.submit_vote(write_poll, next(_uids), "Oui", "added"))
+    polls_db.DB.write_sync(lambda conn: None)
+
+
+@pytest.mark.parametrize("batch", [50, 500])
+def test_apply_vote_batch(benchmark, loop, write_poll, batch):
+    def apply():
+        ops = [(write_poll, next(_uids), "Oui", "added") for _ in range(batch)]
+        loop.run_until_complete(polls_db.apply_vote_batch_async(ops))
+
+    benchmark(apply)
+
+
+def test_fetch_open_polls(benchmark, loop, seeded_polls):
+    # démarrage : tous les sondages ouverts, votes inclus
+    polls = benchmark.pedantic(
+        loop.run_until_complete, setup=lambda: ((polls_db.fetch_open_polls_async(),), {}),
+        rounds=5
+    )
+    assert len(polls) >= len(POLL_SIZES)
+
+
+@pytest.mark.parametrize("targets", [100, 5000])
+def test_outbox(benchmark, loop, seeded_polls, targets):
+    poll_id = seeded_polls[POLL_SIZES[0]]["poll_id"]
+    jobs = itertools.count()
+
+    def roundtrip():
+        job_id = f"job{targets}-{next(jobs)}"
+        user_ids = list(range(targets))
+        loop.run_until_complete(
+            polls_db.outbox_create_async(job_id, poll_id, "rappel", user_ids)
+        )
+        loop.run_until_complete(polls_db.outbox_mark_async([
+            ("sent", 1, None, job_id, uid) for uid in user_ids
+        ]))
+        return loop.run_until_complete(polls_db.outbox_pending_async())
+
+    benchmark(roundtrip)
@@ -0,0 +1,57 @@
+import pytest
+
+from benchmarks.datagen import POLL_SIZES
+from modules.polls import storage
+
+
+@pytest.mark.parametrize("voters", POLL_SIZES)
+def test_save_poll_flush(benchmark, seeded_polls, voters):
+    poll = storage.load_poll(seeded_polls[voters]["poll_id"])
+
+    def save():
+        storage.save_poll(poll)
+        return storage.flush_polls([poll["poll_id"]])
+
+    assert benchmark(save) == 1
+
+
+@pytest.mark.parametrize("voters", POLL_SIZES)
+def test_load_poll_cold(benchmark, seeded_polls, voters):
+    poll_id = seeded_polls[voters]["poll_id"]
+
+    def evict():
+        storage.evict_poll(poll_id)
+
+    poll = benchmark.pedantic(
+        storage.load_poll, args=(poll_id,), setup=evict, rounds=20
+    )
+    assert poll["votes"].voter_count == voters
+
+
+@pytest.mark.parametrize("voters", POLL_SIZES)
+def test_load_poll_cached(benchmark, seeded_polls, voters):
+    poll_id = seeded_polls[voters]["poll_id"]
+    storage.load_poll(poll_id)
+
+    assert benchmark(storage.load_poll, poll_id) is not None
+
+
+def test_transaction_dirty_only_on_change(loop, seeded_polls):
+    poll_id = seeded_polls[POLL_SIZES[0]]["poll_id"]
+    storage.load_poll(poll_id)
+    storage.flush_polls([poll_id])
+
+    async def read_only():
+        async with storage.poll_transaction(poll_id) as poll:
+            return poll["status"]
+
+    async def touch():
+        async with storage.poll_transaction(poll_id) as poll:
+            poll["last_notify_ts"] = poll.get("last_notify_ts", 0) + 1
+
+    loop.run_until_complete(read_only())
+    assert poll_id not in storage._DIRTY
+
+    loop.run_until_complete(touch())
+    assert poll_id in storage._DIRTY
+    storage.flush_polls([poll_id])
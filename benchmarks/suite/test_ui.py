@@ -0,0 +1,21 @@
+import pytest
+
+from benchmarks.datagen import POLL_SIZES, gen_poll, with_vote_store
+
+pytest.importorskip("discord")
+
+from modules.polls.ui import build_poll_embed, render_fingerprint  # noqa: E402
+
+
+@pytest.mark.parametrize("voters", POLL_SIZES)
+def test_build_poll_embed(benchmark, voters):
+    poll = with_vote_store(gen_poll(voters))
+
+    embed = benchmark(build_poll_embed, poll)
+    assert embed is not None
+
+
+@pytest.mark.parametrize("voters", POLL_SIZES)
+def test_render_fingerprint(benchmark, voters):
+    poll = with_vote_store(gen_poll(voters))
+    benchmark(render_fingerprint, poll)
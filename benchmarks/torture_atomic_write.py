@@ -0,0 +1,136 @@
+"""
+Torture test des écritures de fichiers : un processus écrivain est tué
+(SIGKILL) à des instants aléatoires, puis chaque fichier cible doit se
+relire intégralement (JSON valide, empreinte correcte).
+
+    python -m benchmarks.torture_atomic_write --rounds 50
+
+Modes comparés :
+  legacy  open("w") + json.dump(indent=2), l'ancien chemin
+  atomic  core.fileio.atomic_write (fsync à chaque écriture)
+  batched core.fileio.FileFlusher (fsync groupés)
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+from core.fileio import FileFlusher, atomic_write, discard_partial_files
+
+TARGETS = 8
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def payload(seq: int, rnd: random.Random) -> dict:
+    votes = {str(rnd.randrange(10**17, 10**18)): ["A"] for _ in range(rnd.randint(100, 3000))}
+    body = json.dumps(votes, sort_keys=True)
+    return {
+        "seq": seq,
+        "votes": votes,
+        "sha": hashlib.sha256(body.encode()).hexdigest()
+    }
+
+
+def writer(directory: str, mode: str):
+    rnd = random.Random(os.getpid())
+    flusher = FileFlusher()
+    seq = 0
+
+    while True:
+        seq += 1
+        path = os.path.join(directory, f"poll_{seq % TARGETS}.json")
+        data = payload(seq, rnd)
+
+        if mode == "legacy":
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+        elif mode == "atomic":
+            atomic_write(path, json.dumps(data, indent=2))
+        else:
+            flusher.write(path, json.dumps(data, indent=2))
+            if seq % TARGETS == 0:
+                flusher.flush()
+
+
+def verify(directory: str) -> tuple[int, int]:
+    ok = corrupted = 0
+
+    for name in os.listdir(directory):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(directory, name), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            body = json.dumps(data["votes"], sort_keys=True)
+            assert hashlib.sha256(body.encode()).hexdigest() == data["sha"]
+            ok += 1
+        except Exception:
+            corrupted += 1
+
+    return ok, corrupted
+
+
+def torture(mode: str, rounds: int, seed: int) -> dict:
+    rnd = random.Random(seed)
+    totals = {"ok": 0, "corrupted": 0, "partial": 0}
+
+    # l'écrivain retrouve benchmarks/ et core/ quel que soit le cwd
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (ROOT, env.get("PYTHONPATH")) if p
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(rounds):
+            proc = subprocess.Popen(
+                [sys.executable, "-m", "benchmarks.torture_atomic_write",
+                 "--child", tmp, "--mode", mode],
+                env=env
+            )
+            time.sleep(rnd.uniform(0.05, 0.4))
+            proc.send_signal(signal.SIGKILL)
+            if proc.wait() != -signal.SIGKILL:
+                # l'écrivain boucle sans fin : sorti seul = planté
+                raise RuntimeError(f"writer exited with code {proc.returncode}")
+
+            ok, corrupted = verify(tmp)
+            totals["ok"] += ok
+            totals["corrupted"] += corrupted
+            totals["partial"] += discard_partial_files(tmp)
+
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--mode", choices=["legacy", "atomic", "batched"])
+    parser.add_argument("--child")
+    args = parser.parse_args()
+
+    if args.child:
+        writer(args.child, args.mode)
+        return
+
+    failed = False
+    for mode in [args.mode] if args.mode else ["legacy", "atomic", "batched"]:
+        t = torture(mode, args.rounds, args.seed)
+        print(
+            f"{mode:8} fichiers relus={t['ok']:5} corrompus={t['corrupted']:4} "
+            f"temporaires nettoyés={t['partial']}"
+        )
+        if mode != "legacy" and t["corrupted"]:
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
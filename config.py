@@ -24,3 +24,29 @@ DEFAULT_POLL_NOTIFY_ROLES = _cfg.get("DEFAULT_POLL_NOTIFY_ROLES", [])
 
 # === POLL SETTINGS ===
 POLL_NOTIFY_COOLDOWN_SECONDS = _cfg.get("POLL_NOTIFY_COOLDOWN_SECONDS", 600)
+POLL_CACHE_FLUSH_SECONDS = _cfg.get("POLL_CACHE_FLUSH_SECONDS", 5)
+POLL_VOTE_BATCH_MS = _cfg.get("POLL_VOTE_BATCH_MS", 50)
+POLL_VOTE_BATCH_SIZE = _cfg.get("POLL_VOTE_BATCH_SIZE", 500)
+POLL_EMBED_REFRESH_SECONDS = _cfg.get("POLL_EMBED_REFRESH_SECONDS", 2)
+POLL_DM_CONCURRENCY = _cfg.get("POLL_DM_CONCURRENCY", 4)
+POLL_DM_RATE_PER_SECOND = _cfg.get("POLL_DM_RATE_PER_SECOND", 4)
+POLL_FSYNC_BATCH_SECONDS = _cfg.get("POLL_FSYNC_BATCH_SECONDS", 5)
+POLL_ANNOUNCE_RATE_PER_SECOND = _cfg.get("POLL_ANNOUNCE_RATE_PER_SECOND", 1)
+
+# === RUNTIME ===
+IO_MAX_WORKERS = _cfg.get("IO_MAX_WORKERS", 4)
+LOOP_LAG_WARN_MS = _cfg.get("LOOP_LAG_WARN_MS", 100)
+
+# === METRICS ===
+METRICS_HOST = _cfg.get("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = _cfg.get("METRICS_PORT", 0)  # 0 = endpoint désactivé
+
+# === LOGS ===
+LOG_FORMAT = _cfg.get("LOG_FORMAT", "json")  # "json" | "text"
+LOG_FILE = _cfg.get("LOG_FILE")  # None = stdout seul
+LOG_MAX_BYTES = _cfg.get("LOG_MAX_BYTES", 10 * 1024 * 1024)
+LOG_BACKUP_COUNT = _cfg.get("LOG_BACKUP_COUNT", 5)
+LOG_SAMPLE_RATES = _cfg.get("LOG_SAMPLE_RATES", {"timer_refresh": 0.1})
+
+# === DEBUG ===
+DEBUG_PRETTY_JSON = _cfg.get("DEBUG_PRETTY_JSON", False)
@@ -1,8 +1,24 @@
 import discord
 from discord import app_commands
 
+import config
+
+from core.executor import IO
 from core.logger import log
-from core.module_loader import load_modules, load_module_jobs
+from core.loop_monitor import LOOP_MONITOR
+from core.metrics import METRICS, METRICS_SERVER
+from core.module_loader import (
+    load_modules,
+    load_module_events,
+    load_module_jobs,
+    unload_module_jobs
+)
+
+REST_REQUESTS = METRICS.counter(
+    "discord_rest_requests_total",
+    "Appels REST Discord par route",
+    ("method", "route", "status")
+)
 
 
 class PollBot(discord.Client):
@@ -14,8 +30,47 @@ class PollBot(discord.Client):
         self.guild_id = guild_id
         self.tree = app_commands.CommandTree(self)
 
+        # listeners additionnels des modules : on_<event> -> [coroutines]
+        self._module_listeners: dict[str, list] = {}
+
+    def add_listener(self, func, name: str | None = None):
+        name = name or func.__name__
+        self._module_listeners.setdefault(name, []).append(func)
+
+    def dispatch(self, event_name: str, /, *args, **kwargs):
+        super().dispatch(event_name, *args, **kwargs)
+
+        method = f"on_{event_name}"
+        for func in self._module_listeners.get(method, []):
+            self._schedule_event(func, method, *args, **kwargs)
+
+    def _instrument_http(self):
+        request = self.http.request
+
+        async def counted_request(route, **kwargs):
+            status = "ok"
+            try:
+                return await request(route, **kwargs)
+            except discord.HTTPException as e:
+                status = str(e.status)
+                raise
+            finally:
+                REST_REQUESTS.inc(method=route.method, route=route.path, status=status)
+
+        self.http.request = counted_request
+
     async def setup_hook(self):
+        LOOP_MONITOR.start()
+        self._instrument_http()
+
+        if config.METRICS_PORT:
+            try:
+                await METRICS_SERVER.start(config.METRICS_HOST, config.METRICS_PORT)
+            except OSError as e:
+                log(f"METRICS server failed to start: {e}", "ERROR")
+
         load_modules(self.tree, self.guild_id)
+        load_module_events(self)
 
         guild = discord.Object(id=self.guild_id)
         await self.tree.sync(guild=guild)
@@ -24,3 +79,10 @@ class PollBot(discord.Client):
 
         log("Slash commands synced", "READY")
 
+    async def close(self):
+        await unload_module_jobs(self)
+        await super().close()
+
+        await METRICS_SERVER.stop()
+        LOOP_MONITOR.stop()
+        IO.shutdown()
@@ -1,4 +1,19 @@
+import asyncio
 import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+
+from core.executor import run_io
+from core.logger import log
+from core.metrics import METRICS
+
+SQL_SECONDS = METRICS.histogram(
+    "sqlite_seconds",
+    "Durée des jobs SQLite (lecture ou transaction d'écriture)",
+    ("op", "fn")
+)
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "data", "polls")
@@ -6,3 +21,126 @@ DATA_DIR = os.path.join(BASE_DIR, "data", "polls")
 def db_path(filename: str) -> str:
     os.makedirs(DATA_DIR, exist_ok=True)
     return os.path.join(DATA_DIR, filename)
+
+
+# =========================================================
+# CONNECTION MANAGER
+# =========================================================
+
+class SQLiteManager:
+    """
+    Connexions SQLite longue durée en mode WAL.
+
+    - lectures : une connexion par thread (WAL = lecteurs concurrents)
+    - écritures : un thread writer dédié qui possède sa propre connexion,
+      les jobs sont sérialisés via une file et résolus par des Future
+    """
+
+    def __init__(self, path: str, cached_statements: int = 128):
+        self.path = path
+        self.cached_statements = cached_statements
+
+        self._local = threading.local()
+        self._jobs = queue.SimpleQueue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+
+    def connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    # =========================
+    # READS
+    # =========================
+    def reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self.connect()
+            self._local.conn = conn
+        return conn
+
+    def read(self, fn, *args):
+        with SQL_SECONDS.time(op="read", fn=fn.__name__):
+            return fn(self.reader(), *args)
+
+    async def read_async(self, fn, *args):
+        return await run_io(self.read, fn, *args)
+
+    # =========================
+    # WRITES
+    # =========================
+    def write(self, fn, *args) -> Future:
+        """
+        Planifie fn(conn, *args) sur le thread writer, dans une transaction.
+        Ne bloque pas : retourne un Future résolu après le commit.
+        """
+        self._ensure_writer()
+        future = Future()
+        self._jobs.put((fn, args, future))
+        return future
+
+    def write_sync(self, fn, *args):
+        return self.write(fn, *args).result()
+
+    async def write_async(self, fn, *args):
+        return await asyncio.wrap_future(self.write(fn, *args))
+
+    def _ensure_writer(self):
+        if self._writer and self._writer.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer and self._writer.is_alive():
+                return
+            self._writer = threading.Thread(
+                target=self._writer_loop,
+                name=f"sqlite-writer:{os.path.basename(self.path)}",
+                daemon=True
+            )
+            self._writer.start()
+
+    def _writer_loop(self):
+        conn = self.connect()
+
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+
+            fn, args, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                with SQL_SECONDS.time(op="write", fn=fn.__name__), conn:
+                    result = fn(conn, *args)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+        conn.close()
+
+    def close(self):
+        if self._writer and self._writer.is_alive():
+            self._jobs.put(None)
+            self._writer.join()
+        self._writer = None
+
+
+def log_write_errors(future: Future, label: str):
+    def _done(f: Future):
+        if f.cancelled():
+            return
+        e = f.exception()
+        if e:
+            log(f"DB write failed [{label}]: {e}", "ERROR")
+
+    future.add_done_callback(_done)
+    return future
@@ -0,0 +1,46 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+
+# =========================================================
+# I/O EXECUTOR
+# =========================================================
+
+class IOExecutor:
+    """
+    Pool de threads borné pour les I/O bloquantes (disque, SQLite) :
+    `await IO.run(fn, ...)` libère la boucle pendant l'appel.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._pool: ThreadPoolExecutor | None = None
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="io"
+            )
+        return self._pool
+
+    async def run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor(),
+            functools.partial(fn, *args, **kwargs)
+        )
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+IO = IOExecutor(config.IO_MAX_WORKERS)
+
+
+async def run_io(fn, *args, **kwargs):
+    return await IO.run(fn, *args, **kwargs)
@@ -0,0 +1,152 @@
+import asyncio
+import os
+import tempfile
+import threading
+
+from core.executor import run_io
+from core.logger import log
+
+TMP_SUFFIX = ".tmp"
+
+
+# =========================================================
+# ATOMIC WRITE
+# =========================================================
+
+def _fsync_dir(directory: str):
+    # rend le rename durable (no-op là où un dossier ne s'ouvre pas)
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _write_temp(path: str, data: bytes, fsync: bool) -> str:
+    directory = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(
+        dir=directory,
+        prefix=os.path.basename(path) + ".",
+        suffix=TMP_SUFFIX
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return tmp
+
+
+def _encode(data) -> bytes:
+    return data.encode("utf-8") if isinstance(data, str) else data
+
+
+def atomic_write(path: str, data, fsync: bool = True):
+    """
+    Écrit `data` (str ou bytes) dans un fichier temporaire du même dossier
+    puis le renomme sur `path` : un lecteur voit l'ancien ou le nouveau
+    contenu, jamais un fichier tronqué.
+    """
+    tmp = _write_temp(path, _encode(data), fsync)
+    os.replace(tmp, path)
+    if fsync:
+        _fsync_dir(os.path.dirname(path) or ".")
+
+
+def discard_partial_files(directory: str) -> int:
+    """
+    Supprime les temporaires laissés par un arrêt brutal.
+    """
+    if not os.path.isdir(directory):
+        return 0
+
+    removed = 0
+    for name in os.listdir(directory):
+        if name.endswith(TMP_SUFFIX):
+            try:
+                os.remove(os.path.join(directory, name))
+                removed += 1
+            except OSError:
+                pass
+
+    if removed:
+        log(f"FILEIO removed {removed} partial file(s) in {directory}", "INFO")
+    return removed
+
+
+# =========================================================
+# FSYNC BATCHING
+# =========================================================
+
+class FileFlusher:
+    """
+    Écritures atomiques dont les fsync sont groupés.
+
+    `write()` dépose le contenu dans un temporaire (sans fsync) et le
+    met en attente ; `flush()` fsync tous les temporaires, les renomme
+    puis fsync chaque dossier une fois. Une réécriture du même fichier
+    avant le flush remplace la précédente. Un crash ne laisse que
+    l'ancienne version ou la nouvelle, jamais un fichier tronqué.
+    """
+
+    def __init__(self):
+        self._pending: dict[str, str] = {}  # chemin final -> temporaire
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def write(self, path: str, data):
+        tmp = _write_temp(path, _encode(data), fsync=False)
+
+        with self._lock:
+            previous = self._pending.pop(path, None)
+            self._pending[path] = tmp
+
+        if previous:
+            try:
+                os.unlink(previous)
+            except OSError:
+                pass
+
+    def flush(self) -> int:
+        with self._lock:
+            batch = self._pending
+            self._pending = {}
+
+        if not batch:
+            return 0
+
+        for tmp in batch.values():
+            with open(tmp, "rb") as f:
+                os.fsync(f.fileno())
+
+        directories = set()
+        for path, tmp in batch.items():
+            os.replace(tmp, path)
+            directories.add(os.path.dirname(path) or ".")
+
+        for directory in directories:
+            _fsync_dir(directory)
+
+        return len(batch)
+
+    async def run(self, interval_seconds: float):
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await run_io(self.flush)
+            except Exception as e:
+                log(f"FILEIO flush failed: {e}", "ERROR")
+
+
+FILES = FileFlusher()
@@ -1,9 +1,180 @@
 # core/logger.py
+import atexit
 import datetime
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
 
-def log(message: str, level: str = "INFO"):
-    ts = datetime.datetime.utcnow().isoformat()
-    print(f"[{ts}] [{level}] {message}")
+import config
 
-def module_log(module: str, message: str, level: str = "INFO"):
-    log(f"[{module.upper()}] {message}", level)
\ No newline at end of file
+# =========================================================
+# LOGGER ASYNCHRONE STRUCTURÉ
+# =========================================================
+# log() ne fait qu'un put() dans une file : un thread écrit les lignes
+# JSON (stdout et fichier à rotation par taille). Une sortie lente ne
+# bloque donc jamais la boucle asyncio.
+#
+#   log("POLL closed", "POLL", poll_id=pid, event="close")
+#   → {"ts": ..., "level": "POLL", "msg": "POLL closed", "poll_id": ..., ...}
+
+_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "WARN": logging.WARNING,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+_LOGGER = logging.getLogger("pollbot")
+_LOGGER.propagate = False
+_LOGGER.setLevel(logging.DEBUG)
+
+_listener: logging.handlers.QueueListener | None = None
+_handler: logging.Handler | None = None
+_start_lock = threading.Lock()
+
+
+def _ts(record: logging.LogRecord) -> str:
+    return datetime.datetime.fromtimestamp(
+        record.created, datetime.timezone.utc
+    ).replace(tzinfo=None).isoformat()
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": _ts(record),
+            "level": record.label,
+            "msg": record.getMessage(),
+        }
+        entry.update(record.fields)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    # ancien rendu : [ts] [LEVEL] message key=value…
+    def format(self, record: logging.LogRecord) -> str:
+        ts = _ts(record)
+        extra = "".join(f" {k}={v}" for k, v in record.fields.items())
+        return f"[{ts}] [{record.label}] {record.getMessage()}{extra}"
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Garde 1 entrée sur N pour les clés configurées (event, sinon niveau) :
+    LOG_SAMPLE_RATES = {"timer_refresh": 0.1, "DEBUG": 0.5}
+    WARN et ERROR ne sont jamais échantillonnés.
+    """
+
+    def __init__(self, rates: dict):
+        super().__init__()
+        self.every = {
+            key: max(1, round(1 / rate))
+            for key, rate in rates.items()
+            if rate > 0
+        }
+        self.dropped = {key for key, rate in rates.items() if rate <= 0}
+        self._seen: dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        event = record.fields.get("event")
+        key = event if event in self.every or event in self.dropped else record.label
+
+        if key in self.dropped:
+            return False
+
+        every = self.every.get(key)
+        if not every or every == 1:
+            return True
+
+        seen = self._seen.get(key, 0)
+        self._seen[key] = seen + 1
+        return seen % every == 0
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    # log() passe un message déjà formaté, sans args ni exc_info :
+    # inutile de formater/copier l'enregistrement sur le thread appelant
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _handlers() -> list[logging.Handler]:
+    fmt = config.LOG_FORMAT
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(TextFormatter() if fmt == "text" else JsonFormatter())
+    handlers = [stream]
+
+    path = config.LOG_FILE
+    if path:
+        rotating = logging.handlers.RotatingFileHandler(
+            path,
+            maxBytes=config.LOG_MAX_BYTES,
+            backupCount=config.LOG_BACKUP_COUNT,
+            encoding="utf-8",
+            delay=True
+        )
+        rotating.setFormatter(JsonFormatter())
+        handlers.append(rotating)
+
+    return handlers
+
+
+def _ensure_started():
+    global _listener, _handler
+    if _listener is not None:
+        return
+
+    with _start_lock:
+        if _listener is not None:
+            return
+
+        q = queue.SimpleQueue()
+        _handler = _QueueHandler(q)
+        _handler.addFilter(SamplingFilter(config.LOG_SAMPLE_RATES))
+        _LOGGER.addHandler(_handler)
+
+        _listener = logging.handlers.QueueListener(
+            q, *_handlers(), respect_handler_level=False
+        )
+        _listener.start()
+
+
+def shutdown():
+    """
+    Vide la file et arrête le thread d'écriture (appelé à la sortie).
+    """
+    global _listener, _handler
+    with _start_lock:
+        if _handler is not None:
+            _LOGGER.removeHandler(_handler)
+            _handler = None
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+atexit.register(shutdown)
+
+
+# =========================================================
+# API (compatible avec l'ancien print)
+# =========================================================
+
+def log(message: str, level: str = "INFO", **fields):
+    _ensure_started()
+    _LOGGER.log(
+        _LEVELS.get(level, logging.INFO),
+        message,
+        extra={"label": level, "fields": fields}
+    )
+
+
+def module_log(module: str, message: str, level: str = "INFO", **fields):
+    log(f"[{module.upper()}] {message}", level, module=module, **fields)
@@ -0,0 +1,62 @@
+import asyncio
+
+import config
+
+from core.logger import log
+from core.metrics import METRICS
+
+LOOP_LAG_SECONDS = METRICS.histogram(
+    "event_loop_lag_seconds",
+    "Retard de réveil de la sonde de boucle asyncio"
+)
+
+# =========================================================
+# LOOP LAG MONITOR
+# =========================================================
+
+class LoopLagMonitor:
+    """
+    Sonde la boucle asyncio : une tâche dort `interval` secondes et mesure
+    son retard au réveil. Tout retard au-delà du seuil signifie qu'un
+    callback a bloqué la boucle (heartbeats gateway compris) : on le logue.
+    """
+
+    def __init__(self, interval_seconds: float, threshold_ms: float):
+        self.interval = interval_seconds
+        self.threshold = threshold_ms / 1000
+
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if self._task and not self._task.done():
+            return
+
+        loop = asyncio.get_running_loop()
+        # en mode debug asyncio (PYTHONASYNCIODEBUG=1), nomme le callback fautif
+        loop.slow_callback_duration = self.threshold
+        self._task = loop.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+
+            lag = max(0.0, loop.time() - expected)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            LOOP_LAG_SECONDS.observe(lag)
+
+            if lag > self.threshold:
+                log(f"LOOP blocked for {lag * 1000:.0f}ms", "WARN")
+
+
+LOOP_MONITOR = LoopLagMonitor(0.1, config.LOOP_LAG_WARN_MS)
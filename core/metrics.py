@@ -0,0 +1,310 @@
+import asyncio
+import contextlib
+import math
+import threading
+import time
+
+from core.logger import log
+
+# =========================================================
+# METRICS (format texte Prometheus)
+# =========================================================
+# Compteurs, jauges et histogrammes en mémoire, sans dépendance.
+# Thread-safe : le thread writer SQLite et le pool d'I/O y écrivent aussi.
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def _labels_key(labelnames: tuple, labels: dict) -> tuple:
+    return tuple(str(labels.get(name, "")) for name in labelnames)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames: tuple, key: tuple, extra: str = "") -> str:
+    parts = [
+        f'{name}="{_escape(value)}"'
+        for name, value in zip(labelnames, key)
+    ]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _format_ms(seconds: float) -> str:
+    return "∞" if math.isinf(seconds) else f"{seconds * 1000:g}ms"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} {self.kind}"
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, value: float = 1, **labels):
+        key = _labels_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def value(self, **labels) -> float:
+        return self._values.get(_labels_key(self.labelnames, labels), 0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, _format_labels(self.labelnames, key), value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple, float] = {}
+        self._functions: dict[tuple, object] = {}
+
+    def set(self, value: float, **labels):
+        key = _labels_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, fn, **labels):
+        """
+        Valeur calculée à chaque rendu (taille de file, etc.)
+        """
+        self._functions[_labels_key(self.labelnames, labels)] = fn
+
+    def samples(self):
+        with self._lock:
+            items = dict(self._values)
+        for key, fn in list(self._functions.items()):
+            try:
+                items[key] = fn()
+            except Exception:
+                continue
+        for key, value in items.items():
+            yield self.name, _format_labels(self.labelnames, key), value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # key -> [compteurs par bucket..., somme, total]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = _labels_key(self.labelnames, labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    @contextlib.contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self, **labels) -> dict | None:
+        """
+        {count, sum, p50, p99} approximés depuis les buckets.
+        """
+        state = self._values.get(_labels_key(self.labelnames, labels))
+        return self._summarize(state)
+
+    def _summarize(self, state: list | None) -> dict | None:
+        if not state or not state[-1]:
+            return None
+        return {
+            "count": state[-1],
+            "sum": state[-2],
+            "p50": self._quantile(state, 0.5),
+            "p99": self._quantile(state, 0.99)
+        }
+
+    def snapshots(self):
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        for key, state in items:
+            yield _format_labels(self.labelnames, key), self._summarize(state)
+
+    def _quantile(self, state: list, q: float) -> float:
+        rank = q * state[-1]
+        seen = 0
+        for bound, count in zip(self.buckets, state):
+            seen += count
+            if seen >= rank:
+                return bound
+        return math.inf
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield (
+                    f"{self.name}_bucket",
+                    _format_labels(self.labelnames, key, le),
+                    cumulative
+                )
+            yield f"{self.name}_sum", _format_labels(self.labelnames, key), state[-2]
+            yield f"{self.name}_count", _format_labels(self.labelnames, key), state[-1]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help_text, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(
+                    name, help_text, labelnames, **kwargs
+                )
+            return metric
+
+    def counter(self, name, help_text, labelnames=()) -> Counter:
+        return self._get(Counter, name, help_text, labelnames)
+
+    def gauge(self, name, help_text, labelnames=()) -> Gauge:
+        return self._get(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def metrics(self) -> list[_Metric]:
+        return list(self._metrics.values())
+
+    def summary(self) -> list[str]:
+        """
+        Résumé lisible (commande /poll_metrics) : p50/p99 des histogrammes,
+        valeur des jauges, total des compteurs.
+        """
+        lines = []
+        for metric in self.metrics():
+            if isinstance(metric, Histogram):
+                for labels, snap in metric.snapshots():
+                    if snap:
+                        lines.append(
+                            f"{metric.name}{labels} n={snap['count']} "
+                            f"p50≤{_format_ms(snap['p50'])} p99≤{_format_ms(snap['p99'])}"
+                        )
+            elif isinstance(metric, Gauge):
+                for _, labels, value in metric.samples():
+                    lines.append(f"{metric.name}{labels} {_format_value(value)}")
+            else:
+                total = sum(value for _, _, value in metric.samples())
+                lines.append(f"{metric.name} {_format_value(total)}")
+        return lines
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics():
+            lines.extend(metric.header())
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Registry()
+
+# =========================================================
+# HTTP ENDPOINT
+# =========================================================
+
+class MetricsServer:
+    """
+    GET /metrics en texte Prometheus, via asyncio.start_server.
+    À n'exposer qu'en local (METRICS_HOST = 127.0.0.1 par défaut).
+    """
+
+    def __init__(self, registry: Registry = METRICS):
+        self.registry = registry
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self, host: str, port: int):
+        if self._server is not None:
+            return
+        self._server = await asyncio.start_server(self._handle, host, port)
+        log(f"METRICS listening on http://{host}:{port}/metrics", "INFO")
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader, writer):
+        try:
+            request = await asyncio.wait_for(reader.readline(), timeout=5)
+            # on ignore les en-têtes
+            while (await asyncio.wait_for(reader.readline(), timeout=5)).strip():
+                pass
+
+            parts = request.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                status = "200 OK"
+                body = self.registry.render().encode("utf-8")
+            else:
+                status = "404 Not Found"
+                body = b"not found\n"
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+METRICS_SERVER = MetricsServer()
@@ -38,6 +38,27 @@ def load_modules(tree, guild_id, base_package="modules"):
             module_log(module_name, f"failed to load: {e}", "ERROR")
             raise
 
+def load_module_events(bot, base_package="modules"):
+    package = importlib.import_module(base_package)
+
+    for module_info in pkgutil.iter_modules(package.__path__):
+        module_name = module_info.name
+
+        if not MODULES_CONFIG.get(module_name, True):
+            continue
+
+        events_path = f"{base_package}.{module_name}.events"
+
+        try:
+            events_module = importlib.import_module(events_path)
+        except ModuleNotFoundError:
+            # events.py optionnel
+            continue
+
+        if hasattr(events_module, "setup"):
+            events_module.setup(bot)
+
+
 async def load_module_jobs(bot, base_package="modules"):
     from config import MODULES_CONFIG
     from core.logger import module_log
@@ -67,4 +88,28 @@ async def load_module_jobs(bot, base_package="modules"):
 
         except Exception as e:
             module_log(module_name, f"jobs failed: {e}", "ERROR")
-            raise
\ No newline at end of file
+            raise
+
+async def unload_module_jobs(bot, base_package="modules"):
+    package = importlib.import_module(base_package)
+
+    for module_info in pkgutil.iter_modules(package.__path__):
+        module_name = module_info.name
+
+        if not MODULES_CONFIG.get(module_name, True):
+            continue
+
+        jobs_path = f"{base_package}.{module_name}.jobs"
+
+        try:
+            jobs_module = importlib.import_module(jobs_path)
+        except ModuleNotFoundError:
+            continue
+
+        if not hasattr(jobs_module, "teardown"):
+            continue
+
+        try:
+            await jobs_module.teardown(bot)
+        except Exception as e:
+            module_log(module_name, f"jobs teardown failed: {e}", "ERROR")
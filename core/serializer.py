@@ -0,0 +1,56 @@
+import json
+
+import config
+
+# =========================================================
+# JSON CODEC
+# =========================================================
+# orjson si installé (optionnel), sinon json stdlib en sortie compacte.
+# DEBUG_PRETTY_JSON = true dans config.json → sortie indentée lisible.
+
+try:
+    import orjson
+except ImportError:  # backend optionnel
+    orjson = None
+
+BACKEND = "orjson" if orjson else "json"
+
+
+def _pretty(pretty: bool | None) -> bool:
+    if pretty is None:
+        return bool(getattr(config, "DEBUG_PRETTY_JSON", False))
+    return pretty
+
+
+def dumps(obj, pretty: bool | None = None) -> bytes:
+    """
+    Encode en UTF-8 (bytes), compact par défaut.
+    """
+    pretty = _pretty(pretty)
+
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+    if pretty:
+        text = json.dumps(obj, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+    return text.encode("utf-8")
+
+
+def dumps_str(obj) -> str:
+    """
+    Variante str compacte (colonnes SQLite).
+    """
+    return dumps(obj, pretty=False).decode("utf-8")
+
+
+def loads(data: bytes | str):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_file(path: str):
+    with open(path, "rb") as f:
+        return loads(f.read())
@@ -2,6 +2,7 @@
 from config import DISCORD_TOKEN, GUILD_ID
 from core.bot import PollBot
 from modules.polls.polls_db import init_db
+from modules.polls.migrate import migrate_all
 
 
 if __name__ == "__main__":
@@ -10,6 +11,7 @@ if __name__ == "__main__":
         raise RuntimeError("POLLBOT_TOKEN manquant")
 
     init_db()
+    migrate_all()
 
     bot = PollBot(guild_id=GUILD_ID)
     bot.run(DISCORD_TOKEN)
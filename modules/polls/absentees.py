@@ -0,0 +1,77 @@
+from modules.polls.role_index import ROLE_INDEX, missing_voter_ids
+
+
+# =========================
+# ABSENTEE SNAPSHOTS
+# =========================
+class AbsenteeSnapshot:
+    """
+    Liste figée des absents d'un sondage, pour une version donnée
+    (votants, index des rôles, rôles ciblés).
+    """
+
+    __slots__ = ("poll_id", "key", "user_ids")
+
+    def __init__(self, poll_id: str, key: tuple, user_ids: tuple[int, ...]):
+        self.poll_id = poll_id
+        self.key = key
+        self.user_ids = user_ids
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def members(self, guild) -> list:
+        # membres partis depuis le calcul ignorés
+        missing = []
+        for uid in self.user_ids:
+            m = guild.get_member(uid)
+            if m:
+                missing.append(m)
+        return missing
+
+
+class AbsenteeCache:
+    """
+    Un snapshot par sondage et par jeu de rôles ciblés, recalculé seulement
+    quand la version change : arrivée/départ d'un votant (VoteStore.version)
+    ou changement de l'index des rôles du serveur (RoleIndex.version).
+    Notify, MP, alerte, fermeture et /poll_status partagent ainsi le même
+    calcul ; une lecture avec d'autres rôles n'évince pas celui des rôles
+    du sondage.
+    """
+
+    def __init__(self):
+        # poll_id -> rôles ciblés -> snapshot
+        self._snapshots: dict[str, dict[tuple, AbsenteeSnapshot]] = {}
+
+    def get(self, guild, poll: dict, notify_roles=None) -> AbsenteeSnapshot:
+        if notify_roles is None:
+            notify_roles = poll.get("notify_roles") or []
+
+        roles = tuple(notify_roles)
+        key = (poll["votes"].version, ROLE_INDEX.version(guild), roles)
+
+        by_roles = self._snapshots.setdefault(poll["poll_id"], {})
+        snapshot = by_roles.get(roles)
+        if snapshot is None or snapshot.key != key:
+            snapshot = AbsenteeSnapshot(
+                poll["poll_id"],
+                key,
+                tuple(missing_voter_ids(guild, poll, notify_roles))
+            )
+            by_roles[roles] = snapshot
+
+        return snapshot
+
+    def drop(self, poll_id: str):
+        self._snapshots.pop(poll_id, None)
+
+
+ABSENTEES = AbsenteeCache()
+
+
+def find_missing_voters(guild, poll: dict) -> list:
+    """
+    Membres des notify_roles du sondage qui n'ont pas voté (snapshot partagé).
+    """
+    return ABSENTEES.get(guild, poll).members(guild)
@@ -0,0 +1,159 @@
+import asyncio
+
+import config
+
+from core.logger import log
+from core.metrics import METRICS
+from modules.polls.ratelimit import TokenBucket, send_with_retry
+from modules.polls.utils import split_message
+
+MESSAGE_LIMIT = 2000
+# Discord : ~5 messages / 5 s par salon
+CHANNEL_BURST = 5
+
+CHUNKS = METRICS.counter(
+    "poll_announce_chunks_total",
+    "Messages d'annonce (mentions découpées) par résultat",
+    ("status",)
+)
+
+
+def _split_header(header: str, limit: int) -> list[str]:
+    # par lignes, puis coupe franche d'une ligne trop longue à elle seule
+    parts = []
+    for line in split_message(header, limit) or [""]:
+        parts += [line[i:i + limit] for i in range(0, len(line), limit)] or [""]
+    return parts
+
+
+def chunk_mentions(
+    header: str,
+    mentions: list[str],
+    limit: int = MESSAGE_LIMIT
+) -> list[tuple[str, int]]:
+    """
+    Découpe « header + mentions » en messages de `limit` caractères max,
+    sans jamais couper une mention. L'en-tête ouvre le premier message ;
+    s'il dépasse la limite, il est lui-même réparti sur plusieurs.
+
+    Retourne (contenu, nombre de mentions placées) par message.
+    """
+    chunks = [[part, 0] for part in _split_header(header, limit)]
+    current = chunks[-1]
+    sep = "\n"
+
+    for mention in mentions:
+        if current[0] and len(current[0]) + len(sep) + len(mention) > limit:
+            current = [mention, 0]
+            chunks.append(current)
+        else:
+            current[0] = f"{current[0]}{sep}{mention}" if current[0] else mention
+        current[1] += 1
+        sep = " "
+
+    return [(content, count) for content, count in chunks]
+
+
+# =========================
+# REPORT
+# =========================
+class ChunkResult:
+    __slots__ = ("index", "mentions", "status", "attempts", "error", "message_id")
+
+    def __init__(self, index, mentions, status, attempts, error=None, message_id=None):
+        self.index = index
+        self.mentions = mentions
+        self.status = status
+        self.attempts = attempts
+        self.error = error
+        self.message_id = message_id
+
+
+class AnnouncementReport:
+    def __init__(self, results: list[ChunkResult]):
+        self.results = results
+
+    @property
+    def sent(self) -> int:
+        return sum(1 for r in self.results if r.status == "sent")
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.sent
+
+    @property
+    def reached(self) -> int:
+        return sum(r.mentions for r in self.results if r.status == "sent")
+
+    @property
+    def ok(self) -> bool:
+        return self.failed == 0
+
+    def render(self) -> str:
+        head = "📨 **Absents notifiés**" if self.ok else "⚠️ **Notification partielle**"
+        return (
+            f"{head}\n"
+            f"✅ **Messages** : {self.sent}/{len(self.results)}\n"
+            f"👥 **Mentionnés** : {self.reached}"
+        )
+
+
+# =========================
+# SENDER
+# =========================
+class AnnouncementSender:
+    """
+    Envoi d'annonces à mentions multiples dans un salon.
+
+    Les mentions sont découpées sous la limite de 2000 caractères et les
+    messages partent dans l'ordre, un par un, cadencés par un token bucket
+    par salon. Deux annonces du même salon ne s'entremêlent pas. Les 429
+    mettent le salon en pause, les 5xx sont réessayés.
+    """
+
+    def __init__(self, rate_per_second: float):
+        self.rate = rate_per_second
+        self._buckets: dict[int, TokenBucket] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+
+    def _bucket(self, channel) -> TokenBucket:
+        bucket = self._buckets.get(channel.id)
+        if bucket is None:
+            bucket = self._buckets[channel.id] = TokenBucket(
+                self.rate, max(1.0, CHANNEL_BURST * self.rate)
+            )
+        return bucket
+
+    async def send(self, channel, header: str, mentions: list[str]) -> AnnouncementReport:
+        chunks = chunk_mentions(header, mentions)
+        bucket = self._bucket(channel)
+        lock = self._locks.setdefault(channel.id, asyncio.Lock())
+
+        results = []
+        async with lock:
+            for index, (content, count) in enumerate(chunks):
+                result = await self._send_one(channel, bucket, index, content, count)
+                CHUNKS.inc(status=result.status)
+                results.append(result)
+
+        report = AnnouncementReport(results)
+        log(
+            f"POLL announce channel={channel.id} chunks={len(chunks)} "
+            f"sent={report.sent} failed={report.failed}",
+            "POLL" if report.ok else "WARN",
+            event="announce",
+            mentions=len(mentions)
+        )
+        return report
+
+    async def _send_one(self, channel, bucket, index, content, mentions) -> ChunkResult:
+        status, attempts, error, message = await send_with_retry(
+            bucket, lambda: channel.send(content)
+        )
+        return ChunkResult(
+            index, mentions, status, attempts, error,
+            message_id=getattr(message, "id", None)
+        )
+
+
+ANNOUNCER = AnnouncementSender(config.POLL_ANNOUNCE_RATE_PER_SECOND)
@@ -1,3 +1,5 @@
+import io
+
 import discord
 from discord import app_commands
 
@@ -5,6 +7,7 @@ import config
 
 from core.logger import log
 from core.logger import module_log
+from core.metrics import METRICS
 
 from modules.polls.manager import (
     create_poll,
@@ -14,26 +17,105 @@ from modules.polls.ui import (
     build_poll_embed,
     PollView
 )
-from modules.polls.scheduler import (
-    safe_create_task,
-    auto_close_poll,
-    auto_update_poll_timer,
-    alert_unvoted_members
+from modules.polls.non_voters import (
+    load_non_voters_async,
+    reset_user_absences_async,
+    reset_all_absences_async
 )
-from modules.polls.non_voters import (load_non_voters, reset_user_absences, reset_all_absences)
 
-from modules.polls.polls_db import get_poll, get_votes
-from modules.polls.utils import paginate
+from modules.polls.absentees import ABSENTEES
+from modules.polls.storage import load_poll_async
+
+# =========================
+# /poll_status — PAGES À LA DEMANDE
+# =========================
+class PollStatusPages:
+    """
+    Pages de /poll_status, décrites par (section, option, début) et
+    rendues en discord.Embed seulement quand la vue les affiche.
+    """
+
+    PER_PAGE = 15
+
+    def __init__(self, poll: dict, votes: dict[str, list[int]], missing: list[int]):
+        self.poll = poll
+        self.votes = votes
+        self.missing = missing
+
+        self._plan = [("summary", None, 0)]
+        for option, user_ids in votes.items():
+            self._plan += [
+                ("option", option, start)
+                for start in range(0, len(user_ids), self.PER_PAGE)
+            ]
+        self._plan += [
+            ("missing", None, start)
+            for start in range(0, len(missing), self.PER_PAGE)
+        ]
+
+    def __len__(self) -> int:
+        return len(self._plan)
+
+    def _page_footer(self, total: int, start: int) -> str:
+        pages = -(-total // self.PER_PAGE)
+        return f"Page {start // self.PER_PAGE + 1}/{pages}"
+
+    def render(self, index: int) -> discord.Embed:
+        section, option, start = self._plan[index]
+        end = start + self.PER_PAGE
+
+        if section == "summary":
+            return self._summary()
+
+        if section == "option":
+            user_ids = self.votes[option]
+            e = discord.Embed(
+                title=f"🗳️ {option} — {len(user_ids)} vote(s)",
+                description="\n".join(f"<@{uid}>" for uid in user_ids[start:end]),
+                color=discord.Color.blurple()
+            )
+            e.set_footer(
+                text=f"{self._page_footer(len(user_ids), start)} • Option {option}"
+            )
+            return e
+
+        e = discord.Embed(
+            title=f"🚫 N'ont pas voté — {len(self.missing)}",
+            description="\n".join(f"<@{uid}>" for uid in self.missing[start:end]),
+            color=discord.Color.red()
+        )
+        e.set_footer(text=self._page_footer(len(self.missing), start))
+        return e
+
+    def _summary(self) -> discord.Embed:
+        poll = self.poll
+        total_votes = sum(len(v) for v in self.votes.values())
+
+        summary = discord.Embed(
+            title="📊 Statut du sondage",
+            description=poll["question"],
+            color=discord.Color.dark_teal()
+        )
+        summary.add_field(name="🗳️ Votants", value=str(total_votes), inline=True)
+        summary.add_field(name="🚫 Absents", value=str(len(self.missing)), inline=True)
+        summary.add_field(
+            name="🔁 Multi-vote",
+            value="Activé" if poll.get("multiple", True) else "Désactivé",
+            inline=True
+        )
+        summary.set_footer(text=f"ID : {poll['poll_id']} • Sauron")
+        return summary
+
 
 class PollStatusView(discord.ui.View):
-    def __init__(self, embeds):
+    def __init__(self, pages: PollStatusPages):
         super().__init__(timeout=180)
-        self.embeds = embeds
+        self.pages = pages
         self.index = 0
 
     async def update(self, interaction: discord.Interaction):
         await interaction.response.edit_message(
-            embed=self.embeds[self.index],
+            embed=self.pages.render(self.index),
             view=self
         )
 
@@ -45,7 +127,7 @@ class PollStatusView(discord.ui.View):
 
     @discord.ui.button(label="➡️", style=discord.ButtonStyle.secondary)
     async def next(self, interaction: discord.Interaction, _):
-        if self.index < len(self.embeds) - 1:
+        if self.index < len(self.pages) - 1:
             self.index += 1
         await self.update(interaction)
 
@@ -56,6 +138,7 @@ class PollStatusView(discord.ui.View):
             embed=None,
             view=None
         )
+
 # =========================
 # SETUP
 # =========================
@@ -113,14 +196,11 @@ def setup_poll_commands(tree: app_commands.CommandTree, GUILD_ID: int):
         )
 
         msg = await interaction.original_response()
-        poll["message_id"] = msg.id
-        poll["channel_id"] = msg.channel.id
-
-        from modules.polls.storage import save_poll
-        save_poll(poll)
 
-        from modules.polls.polls_db import create_poll as db_create_poll
-        db_create_poll(poll)
+        from modules.polls.storage import poll_transaction
+        async with poll_transaction(poll_id) as poll:
+            poll["message_id"] = msg.id
+            poll["channel_id"] = msg.channel.id
 
         log(f"POLL created id={poll_id}", "POLL")
         
@@ -149,6 +229,9 @@ def setup_poll_commands(tree: app_commands.CommandTree, GUILD_ID: int):
                 "`/poll_absences_reset_user @User`\n"
                 "`/poll_absences_reset_all`\n\n"
 
+                "**Métriques**\n"
+                "`/poll_metrics`\n\n"
+
                 "**Boutons sur le sondage**\n"
                 "⏱️ Durée • 📣 Notifier absents\n\n"
 
@@ -167,7 +250,7 @@ def setup_poll_commands(tree: app_commands.CommandTree, GUILD_ID: int):
     # =========================
     @tree.command(name="poll_absences", guild=discord.Object(id=GUILD_ID))
     async def poll_absences(interaction: discord.Interaction):
-        data = load_non_voters()
+        data = await load_non_voters_async()
         if not data:
             await interaction.response.send_message(
                 "✅ Aucune absence enregistrée",
@@ -176,8 +259,8 @@ def setup_poll_commands(tree: app_commands.CommandTree, GUILD_ID: int):
             return
 
         lines = [
-            f"<@{uid}> : {count} absence(s)"
-            for uid, count in data.items()
+            f"<@{uid}> : {entry['missed_votes']} absence(s)"
+            for uid, entry in data.items()
         ]
 
         await interaction.response.send_message(
@@ -207,13 +290,17 @@ def setup_poll_commands(tree: app_commands.CommandTree, GUILD_ID: int):
 
         from modules.polls.scheduler import close_poll_and_process
 
+        # la fermeture annonce les absents (envois cadencés) : on acquitte
+        # d'abord pour rester dans la fenêtre de 3s
+        await interaction.response.defer(ephemeral=True)
+
         await close_poll_and_process(
             interaction.client,
             poll_id,
             reason="manual"
         )
 
-        await interaction.response.send_message(
+        await interaction.followup.send(
             f"🔒 Sondage `{poll_id}` fermé manuellement",
             ephemeral=True
         )
@@ -239,7 +326,7 @@ def setup_poll_commands(tree: app_commands.CommandTree, GUILD_ID: int):
                 ephemeral=True
             )
 
-        success = reset_user_absences(member.id)
+        success = await reset_user_absences_async(member.id)
 
         if success:
             await interaction.response.send_message(
@@ -264,13 +351,43 @@ def setup_poll_commands(tree: app_commands.CommandTree, GUILD_ID: int):
                 ephemeral=True
             )
 
-        reset_all_absences()
+        await reset_all_absences_async()
 
         await interaction.response.send_message(
             "🧹 **La base des absents a été entièrement réinitialisée.**",
             ephemeral=True
         )
 
+    # =========================
+    # /poll_metrics
+    # =========================
+    @tree.command(name="poll_metrics", guild=discord.Object(id=GUILD_ID))
+    async def poll_metrics(interaction: discord.Interaction):
+        author = interaction.guild.get_member(interaction.user.id)
+        if not author or not any(
+            r.id in config.ADMIN_ROLE_IDS for r in author.roles
+        ):
+            return await interaction.response.send_message(
+                "❌ Commande réservée aux administrateurs",
+                ephemeral=True
+            )
+
+        summary = "\n".join(METRICS.summary()) or "Aucune mesure pour l’instant."
+        if len(summary) > 1900:
+            summary = summary[:1900] + "\n…"
+
+        # export Prometheus complet en pièce jointe
+        export = discord.File(
+            io.BytesIO(METRICS.render().encode("utf-8")),
+            filename="metrics.txt"
+        )
+
+        await interaction.response.send_message(
+            f"📈 **Métriques PollBot**\n```\n{summary}\n```",
+            file=export,
+            ephemeral=True
+        )
+
     # =========================
     # /poll_status
     # =========================
@@ -288,7 +405,7 @@ def setup_poll_commands(tree: app_commands.CommandTree, GUILD_ID: int):
                 ephemeral=True
             )
 
-        poll = get_poll(poll_id)
+        poll = await load_poll_async(poll_id)
         if not poll:
             return await interaction.followup.send(
                 "❌ Sondage introuvable",
@@ -296,93 +413,28 @@ def setup_poll_commands(tree: app_commands.CommandTree, GUILD_ID: int):
             )
 
         guild = interaction.guild
-        votes = get_votes(poll_id)  # { option: [user_id] }
 
         # =========================
-        # Construire votes par option
+        # Votants par option (cache membres, sans REST)
         # =========================
-        vote_lines_by_option = {}
-        all_voters = set()
-
-        for option, user_ids in votes.items():
-            lines = []
-            for uid in user_ids:
-                m = guild.get_member(uid)
-                if m:
-                    lines.append(m.mention)
-                    all_voters.add(uid)
-            vote_lines_by_option[option] = lines
+        votes = {
+            option: [uid for uid in user_ids if guild.get_member(uid)]
+            for option, user_ids in poll["votes"].voters_by_option().items()
+        }
 
         # =========================
-        # Construire absents
+        # Absents (snapshot partagé, index des rôles)
         # =========================
         notify_roles = poll.get("notify_roles") or config.DEFAULT_POLL_NOTIFY_ROLES or []
-        missing = []
-
-        async for m in guild.fetch_members(limit=None):
-            if m.bot:
-                continue
-            if not any(r.id in notify_roles for r in m.roles):
-                continue
-            if m.id not in all_voters:
-                missing.append(m.mention)
-
-        # =========================
-        # EMBED 1 — RÉSUMÉ
-        # =========================
-        total_votes = sum(len(v) for v in vote_lines_by_option.values())
-
-        summary = discord.Embed(
-            title="📊 Statut du sondage",
-            description=poll["question"],
-            color=discord.Color.dark_teal()
-        )
-        summary.add_field(name="🗳️ Votants", value=str(total_votes), inline=True)
-        summary.add_field(name="🚫 Absents", value=str(len(missing)), inline=True)
-        summary.add_field(
-            name="🔁 Multi-vote",
-            value="Activé" if poll.get("multiple", True) else "Désactivé",
-            inline=True
-        )
-        summary.set_footer(text=f"ID : {poll_id} • Sauron")
-
-        embeds = [summary]
-
-        # =========================
-        # EMBEDS — VOTES PAR OPTION
-        # =========================
-        for option, users in vote_lines_by_option.items():
-            pages = paginate(users, 15)
-            for i, page in enumerate(pages):
-                e = discord.Embed(
-                    title=f"🗳️ {option} — {len(users)} vote(s)",
-                    description="\n".join(page) if page else "Aucun vote",
-                    color=discord.Color.blurple()
-                )
-                e.set_footer(text=f"Page {i+1}/{len(pages)} • Option {option}")
-                embeds.append(e)
-
-        # =========================
-        # EMBEDS — ABSENTS
-        # =========================
-        if missing:
-            pages = paginate(missing, 15)
-            for i, page in enumerate(pages):
-                e = discord.Embed(
-                    title=f"🚫 N'ont pas voté — {len(missing)}",
-                    description="\n".join(page),
-                    color=discord.Color.red()
-                )
-                e.set_footer(text=f"Page {i+1}/{len(pages)}")
-                embeds.append(e)
+        missing = ABSENTEES.get(guild, poll, notify_roles).user_ids
 
         # =========================
-        # ENVOI
+        # ENVOI (page 1 seulement, les autres au fil de la navigation)
         # =========================
-        view = PollStatusView(embeds)
+        pages = PollStatusPages(poll, votes, missing)
         await interaction.followup.send(
-            embed=embeds[0],
-            view=view,
+            embed=pages.render(0),
+            view=PollStatusView(pages),
             ephemeral=True
         )
 
@@ -0,0 +1,168 @@
+import asyncio
+import uuid
+
+import config
+
+from core.logger import log
+from modules.polls.polls_db import (
+    outbox_create_async,
+    outbox_mark_async,
+    outbox_pending_async,
+    outbox_purge_async
+)
+from modules.polls.ratelimit import TokenBucket, send_with_retry
+
+# =========================
+# REPORT
+# =========================
+class DmReport:
+    def __init__(self, job_id: str, total: int):
+        self.job_id = job_id
+        self.total = total
+        self.sent = 0
+        self.failed = 0
+
+    @property
+    def pending(self) -> int:
+        return self.total - self.sent - self.failed
+
+    @property
+    def done(self) -> bool:
+        return self.pending == 0
+
+    def render(self) -> str:
+        head = "✉️ **Envoi terminé**" if self.done else "✉️ **Envoi en cours…**"
+        return (
+            f"{head}\n"
+            f"✅ **Envoyés** : {self.sent}\n"
+            f"❌ **Échecs** : {self.failed}\n"
+            f"⏳ **En attente** : {self.pending}"
+        )
+
+
+# =========================
+# DISPATCHER
+# =========================
+class DmDispatcher:
+    """
+    Envoi de MP en parallèle borné, cadencé par un token bucket.
+
+    Chaque envoi est d'abord inscrit dans l'outbox SQLite (dm_outbox) ;
+    le statut de chaque destinataire y est reporté dès son envoi, et le
+    job est purgé une fois terminé. Au redémarrage, seuls les
+    destinataires encore "pending" sont repris : rien n'est renvoyé.
+    """
+
+    def __init__(self, concurrency: int, rate_per_second: float):
+        self.concurrency = concurrency
+        self.bucket = TokenBucket(rate_per_second, max(1.0, rate_per_second))
+        self._tasks: set[asyncio.Task] = set()
+
+    def _spawn(self, coro):
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def start_job(
+        self,
+        client,
+        poll_id: str,
+        user_ids: list[int],
+        content: str,
+        progress=None
+    ) -> DmReport:
+        job_id = uuid.uuid4().hex[:12]
+        await outbox_create_async(job_id, poll_id, content, user_ids)
+
+        report = DmReport(job_id, len(user_ids))
+        self._spawn(self.run(client, job_id, user_ids, content, report, progress))
+        return report
+
+    async def resume(self, client):
+        # jobs finis avant un arrêt brutal, purge non faite
+        await self._purge()
+        jobs = await outbox_pending_async()
+
+        for job in jobs:
+            log(
+                f"POLL DM job resumed id={job['job_id']} "
+                f"pending={len(job['user_ids'])}",
+                "POLL"
+            )
+            report = DmReport(job["job_id"], len(job["user_ids"]))
+            self._spawn(
+                self.run(client, job["job_id"], job["user_ids"], job["content"], report)
+            )
+
+    async def run(self, client, job_id, user_ids, content, report, progress=None):
+        queue = asyncio.Queue()
+        for uid in user_ids:
+            queue.put_nowait(uid)
+
+        async def worker():
+            while True:
+                try:
+                    uid = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                status, attempts, error = await self._send_one(client, uid, content)
+                if status == "sent":
+                    report.sent += 1
+                else:
+                    report.failed += 1
+
+                # reporté tout de suite : un redémarrage ne renvoie pas ce MP
+                try:
+                    await outbox_mark_async([(status, attempts, error, job_id, uid)])
+                except Exception as e:
+                    log(f"POLL DM outbox update failed: {e}", "ERROR")
+
+        async def notify():
+            if progress is None:
+                return
+            try:
+                await progress(report)
+            except Exception as e:
+                log(f"POLL DM progress update failed: {e}", "ERROR")
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(self.concurrency, max(1, len(user_ids))))
+        ]
+        pending = set(workers)
+
+        while pending:
+            _, pending = await asyncio.wait(pending, timeout=2)
+            if pending:
+                await notify()
+
+        await notify()
+        await self._purge(job_id)
+
+        log(
+            f"POLL DM job done id={job_id} sent={report.sent} failed={report.failed}",
+            "POLL"
+        )
+        return report
+
+    async def _purge(self, job_id: str | None = None):
+        try:
+            await outbox_purge_async(job_id)
+        except Exception as e:
+            log(f"POLL DM outbox purge failed: {e}", "ERROR")
+
+    async def _send_one(self, client, user_id: int, content: str):
+        async def send():
+            user = client.get_user(user_id) or await client.fetch_user(user_id)
+            await user.send(content)
+
+        status, attempts, error, _ = await send_with_retry(self.bucket, send)
+        return status, attempts, error
+
+
+DISPATCHER = DmDispatcher(
+    config.POLL_DM_CONCURRENCY,
+    config.POLL_DM_RATE_PER_SECOND
+)
@@ -0,0 +1,32 @@
+from core.logger import module_log
+from modules.polls.role_index import ROLE_INDEX
+
+
+def setup(bot):
+    async def on_ready():
+        for guild in bot.guilds:
+            ROLE_INDEX.build(guild)
+
+    async def on_member_join(member):
+        ROLE_INDEX.add_member(member)
+
+    async def on_member_remove(member):
+        ROLE_INDEX.remove_member(member)
+
+    async def on_member_update(before, after):
+        if before.roles != after.roles:
+            ROLE_INDEX.update_member(before, after)
+
+    async def on_guild_role_delete(role):
+        ROLE_INDEX.remove_role(role)
+
+    for listener in (
+        on_ready,
+        on_member_join,
+        on_member_remove,
+        on_member_update,
+        on_guild_role_delete,
+    ):
+        bot.add_listener(listener)
+
+    module_log("polls", "events registered")
@@ -1,12 +1,49 @@
+import config
+
+from core.executor import run_io
+from core.fileio import FILES, discard_partial_files
 from core.logger import module_log
-from modules.polls.resume import resume_poll_views
-from modules.polls.scheduler import resume_open_polls
+from modules.polls.manager import ARCHIVE_DIR
+from modules.polls.resume import resume_polls
+from modules.polls.scheduler import safe_create_task
+from modules.polls.storage import flush_polls_async, run_flusher
+from modules.polls.polls_db import DB
+from modules.polls.vote_pipeline import PIPELINE
+from modules.polls.dm_dispatch import DISPATCHER
 
 
 async def setup(bot):
     module_log("polls", "starting jobs")
 
-    await resume_poll_views(bot)
-    await resume_open_polls(bot)
+    PIPELINE.start(
+        config.POLL_VOTE_BATCH_MS,
+        config.POLL_VOTE_BATCH_SIZE
+    )
+
+    safe_create_task(
+        run_flusher(config.POLL_CACHE_FLUSH_SECONDS),
+        "poll_cache_flush"
+    )
+
+    await run_io(discard_partial_files, ARCHIVE_DIR)
+    safe_create_task(
+        FILES.run(config.POLL_FSYNC_BATCH_SECONDS),
+        "file_fsync_flush"
+    )
+
+    await resume_polls(bot)
+    await DISPATCHER.resume(bot)
 
     module_log("polls", "jobs started")
+
+
+async def teardown(bot):
+    await PIPELINE.stop()
+
+    flushed = await flush_polls_async()
+    module_log("polls", f"cache flushed ({flushed} poll(s))")
+
+    written = await run_io(FILES.flush)
+    module_log("polls", f"files flushed ({written} file(s))")
+
+    DB.close()
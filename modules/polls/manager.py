@@ -1,20 +1,26 @@
 import datetime
 import os
-import shutil
 import time
 import uuid
 
+from core.executor import run_io
+from core.fileio import FILES
+from core.logger import log
+from core.serializer import dumps
+from modules.polls.absentees import ABSENTEES
+from modules.polls.storage import (
+    load_poll_async,
+    save_poll,
+    evict_poll_async,
+    poll_transaction
+)
+from modules.polls.vote_pipeline import PIPELINE
+from modules.polls.vote_store import VoteStore
 
-from modules.polls.storage import load_poll, save_poll
-from modules.polls.polls_db import register_vote as db_register_vote
-from modules.polls.polls_db import remove_vote as db_remove_vote
-
-ACTIVE_DIR = "data/polls/active"
 ARCHIVE_DIR = "data/polls/archive"
 
 DEFAULT_RETENTION_DAYS = 30
 
-os.makedirs(ACTIVE_DIR, exist_ok=True)
 os.makedirs(ARCHIVE_DIR, exist_ok=True)
 
 # =========================
@@ -23,12 +29,12 @@ os.makedirs(ARCHIVE_DIR, exist_ok=True)
 def now():
     return datetime.datetime.utcnow()
 
-def active_path(poll_id):
-    return os.path.join(ACTIVE_DIR, f"poll_{poll_id}.json")
-
 def archive_path(poll_id):
     return os.path.join(ARCHIVE_DIR, f"poll_{poll_id}.json")
 
+def archive_votes_path(poll_id):
+    return os.path.join(ARCHIVE_DIR, f"poll_{poll_id}.votes")
+
 def generate_poll_id() -> str:
     return uuid.uuid4().hex[:8]
 
@@ -42,17 +48,35 @@ def cleanup_archives(retention_days=DEFAULT_RETENTION_DAYS):
         if os.path.isfile(path) and os.path.getmtime(path) < limit:
             os.remove(path)
 
+async def cleanup_archives_async(retention_days=DEFAULT_RETENTION_DAYS):
+    await run_io(cleanup_archives, retention_days)
+
 # =========================
 # ARCHIVE
 # =========================
-def archive_poll(poll_id):
-    src = active_path(poll_id)
-    dst = archive_path(poll_id)
-
-    if os.path.exists(src):
-        shutil.move(src, dst)
-
-    cleanup_archives()
+# SQLite reste la source de vérité : l'archive n'est qu'un export lisible
+def _write_archive(poll):
+    # métadonnées + résultats en JSON, votes bruts en binaire (VoteStore)
+    store = poll["votes"]
+    if not store.check():
+        log(f"POLL tallies drift repaired id={poll['poll_id']}", "WARN")
+
+    meta = {k: v for k, v in poll.items() if k != "votes"}
+    meta["results"] = store.counts()
+    meta["voter_count"] = store.voter_count
+
+    # écritures atomiques, fsync groupés par le flusher de fichiers
+    FILES.write(archive_path(poll["poll_id"]), dumps(meta))
+    FILES.write(archive_votes_path(poll["poll_id"]), store.to_bytes())
+
+async def archive_poll_async(poll_id):
+    poll = await load_poll_async(poll_id)
+    if poll:
+        await run_io(_write_archive, poll)
+
+    ABSENTEES.drop(poll_id)
+    await evict_poll_async(poll_id)
+    await cleanup_archives_async()
 
 # =========================
 # CORE LOGIC
@@ -82,7 +106,7 @@ def create_poll(
         "ends_at": ends_at,
         "notify_roles": notify_roles or [],
         "alert_sent": False,
-        "votes": {},
+        "votes": VoteStore(options),
         "message_id": None,
         "channel_id": None
     }
@@ -90,72 +114,44 @@ def create_poll(
     save_poll(poll)
     return poll
 
-def register_vote(poll_id, user_id, option):
-    poll = load_poll(poll_id)
-    if not poll:
-        return None, "closed", None
-
-    if poll.get("ends_at"):
-        ends_at = datetime.datetime.fromisoformat(poll["ends_at"])
-        if now() >= ends_at:
-            poll["status"] = "closed"
-            save_poll(poll)
-            archive_poll(poll_id)
-            return poll, "closed", None
-
-    if poll["status"] != "open":
-        return poll, "closed", None
-
-    uid = str(user_id)
-    votes = poll["votes"].get(uid, [])
-    action = None
-
-    if poll["multiple"]:
-        if option in votes:
-            votes.remove(option)
-            action = "removed"
-        else:
-            votes.append(option)
-            action = "added"
+async def register_vote(poll_id, user_id, option):
+    expired = False
 
-        if votes:
-            poll["votes"][uid] = votes
-        else:
-            poll["votes"].pop(uid, None)
-    else:
-        if votes and votes[0] == option:
-            poll["votes"].pop(uid, None)
-            action = "removed"
+    async with poll_transaction(poll_id) as poll:
+        if not poll:
+            return None, "closed", None
+
+        if poll.get("ends_at"):
+            ends_at = datetime.datetime.fromisoformat(poll["ends_at"])
+            expired = now() >= ends_at
+            if expired:
+                poll["status"] = "closed"
+
+        if poll["status"] != "open":
+            result = poll, "closed", None
+        elif not poll["votes"].has_option(option):
+            result = poll, "invalid", None
         else:
-            poll["votes"][uid] = [option]
-            action = "added"
+            store = poll["votes"]
+            replaced = []
 
-    save_poll(poll)
+            if poll["multiple"]:
+                action = store.toggle(user_id, option)
+            else:
+                action, replaced = store.choose(user_id, option)
 
-    if action == "added":
-        db_register_vote(poll_id, user_id, option)
-    elif action == "removed":
-        db_remove_vote(poll_id, user_id, option)
+            for old_option in replaced:
+                PIPELINE.enqueue(poll_id, user_id, old_option, "removed")
+            PIPELINE.enqueue(poll_id, user_id, option, action)
 
-    return poll, "ok", action
+            result = poll, "ok", action
 
-def compute_results(poll):
-    counts = {opt: 0 for opt in poll["options"]}
-    for votes in poll["votes"].values():
-        for v in votes:
-            if v in counts:
-                counts[v] += 1
-    return counts
-
-def set_status(poll_id, status):
-    poll = load_poll(poll_id)
-    if not poll:
-        return None
-
-    poll["status"] = status
-    save_poll(poll)
+    # hors verrou : l'archivage évince le sondage du cache
+    if expired:
+        await archive_poll_async(poll_id)
 
-    if status == "closed":
-        archive_poll(poll_id)
+    return result
 
-    return poll
+def compute_results(poll):
+    # compteurs maintenus par le VoteStore : O(options), pas O(votants)
+    return poll["votes"].counts()
@@ -0,0 +1,73 @@
+import os
+
+from core.logger import log
+from core.serializer import load_file
+from modules.polls.polls_db import import_poll, init_db
+from modules.polls.storage import ACTIVE_DIR
+from modules.polls import non_voters
+
+MIGRATED_SUFFIX = ".migrated"
+
+
+# =========================
+# JSON → SQLITE (one-shot)
+# =========================
+def migrate_json_polls(active_dir: str = ACTIVE_DIR) -> int:
+    """
+    Importe les anciens data/polls/active/poll_<id>.json dans SQLite.
+    Chaque fichier importé est renommé en .json.migrated : relancer la
+    migration ne fait rien.
+    """
+    if not os.path.isdir(active_dir):
+        return 0
+
+    migrated = 0
+
+    for file in sorted(os.listdir(active_dir)):
+        if not file.startswith("poll_") or not file.endswith(".json"):
+            continue
+
+        path = os.path.join(active_dir, file)
+
+        try:
+            import_poll(load_file(path))
+        except Exception as e:
+            log(f"POLL migration failed file={file}: {e}", "ERROR")
+            continue
+
+        os.replace(path, path + MIGRATED_SUFFIX)
+        migrated += 1
+
+    if migrated:
+        log(f"POLL migration: {migrated} poll(s) imported into SQLite", "POLL")
+
+    return migrated
+
+
+# =========================
+# NON_VOTERS.JSON → SQLITE
+# =========================
+def migrate_non_voters(path: str = non_voters.FILE_PATH) -> int:
+    if not os.path.isfile(path):
+        return 0
+
+    try:
+        entries = load_file(path)
+        imported = non_voters.import_legacy_entries(entries)
+    except Exception as e:
+        log(f"POLL absences migration failed: {e}", "ERROR")
+        return 0
+
+    os.replace(path, path + MIGRATED_SUFFIX)
+    log(f"POLL migration: {imported} absence record(s) imported into SQLite", "POLL")
+    return imported
+
+
+def migrate_all():
+    migrate_json_polls()
+    migrate_non_voters()
+
+
+if __name__ == "__main__":
+    init_db()
+    migrate_all()
@@ -1,62 +1,131 @@
-import json
-import os
 import datetime
 
+from modules.polls.polls_db import DB
+
+# Ancien registre JSON, lu uniquement par la migration
 FILE_PATH = "data/polls/non_voters.json"
-os.makedirs(os.path.dirname(FILE_PATH), exist_ok=True)
 
+# =========================
+# LEDGER (SQLite)
+# =========================
+# Une ligne par (sondage, membre) : les compteurs sont des agrégats.
+# INSERT OR IGNORE → fermer deux fois le même sondage ne compte qu'une fois,
+# et le thread writer unique sérialise les fermetures concurrentes.
 
-def load_non_voters():
-    if not os.path.exists(FILE_PATH):
-        return {}
-    with open(FILE_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+SQL_INSERT_MISSED = """
+    INSERT OR IGNORE INTO missed_votes (
+        poll_id, user_id, display_name, server_name, missed, missed_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+SQL_AGGREGATE = """
+    SELECT user_id, display_name, server_name, SUM(missed), MAX(missed_at)
+    FROM missed_votes
+    GROUP BY user_id
+"""
 
 
-def save_non_voters(data):
-    with open(FILE_PATH, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+def _utc_ts() -> str:
+    return datetime.datetime.utcnow().isoformat() + "Z"
 
 
-def register_missed_vote(member, guild):
-    data = load_non_voters()
-    uid = str(member.id)
+def _insert_missed(conn, rows: list[tuple]):
+    conn.executemany(SQL_INSERT_MISSED, rows)
 
-    # 🔑 source de vérité = user_id
-    entry = data.get(uid)
 
-    if not entry:
-        entry = {
-            "user_id": uid,
-            "display_name": member.display_name,
-            "server_name": guild.name,
-            "missed_votes": 0,
-            "last_missed": None
+def _load_non_voters(conn) -> dict:
+    # SQLite : avec un seul MAX(), les colonnes nues viennent de la ligne max
+    # → display_name / server_name les plus récents
+    return {
+        str(user_id): {
+            "user_id": str(user_id),
+            "display_name": display_name,
+            "server_name": server_name,
+            "missed_votes": missed,
+            "last_missed": last_missed
         }
+        for user_id, display_name, server_name, missed, last_missed
+        in conn.execute(SQL_AGGREGATE)
+    }
+
+
+def _reset_user(conn, user_id: int) -> bool:
+    return conn.execute(
+        "DELETE FROM missed_votes WHERE user_id = ?", (user_id,)
+    ).rowcount > 0
+
+
+def _reset_all(conn):
+    conn.execute("DELETE FROM missed_votes")
+
+
+def missed_rows(members, guild, poll_id: str) -> list[tuple]:
+    ts = _utc_ts()
+    return [
+        (poll_id, m.id, m.display_name, guild.name, 1, ts)
+        for m in members
+    ]
 
-    # 🔄 MAJ dynamique à CHAQUE appel
-    entry["display_name"] = member.display_name
-    entry["server_name"] = guild.name
-    entry["missed_votes"] += 1
-    entry["last_missed"] = (
-        datetime.datetime.utcnow().isoformat() + "Z"
-    )
 
-    data[uid] = entry
-    save_non_voters(data)
+# =========================
+# PUBLIC API
+# =========================
+def load_non_voters() -> dict:
+    return DB.read(_load_non_voters)
+
+
+async def load_non_voters_async() -> dict:
+    return await DB.read_async(_load_non_voters)
+
+
+def register_missed_votes(members, guild, poll_id: str):
+    """
+    Enregistre tous les absents d'une fermeture en une seule transaction.
+    """
+    rows = missed_rows(members, guild, poll_id)
+    if rows:
+        DB.write_sync(_insert_missed, rows)
+
+
+async def register_missed_votes_async(members, guild, poll_id: str):
+    rows = missed_rows(members, guild, poll_id)
+    if rows:
+        await DB.write_async(_insert_missed, rows)
+
 
 def reset_user_absences(user_id: int):
-    data = load_non_voters()
-    uid = str(user_id)
+    return DB.write_sync(_reset_user, user_id)
 
-    if uid in data:
-        del data[uid]
-        save_non_voters(data)
-        return True
 
-    return False
+async def reset_user_absences_async(user_id: int) -> bool:
+    return await DB.write_async(_reset_user, user_id)
 
 
 def reset_all_absences():
-    save_non_voters({})
-
+    DB.write_sync(_reset_all)
+
+
+async def reset_all_absences_async():
+    await DB.write_async(_reset_all)
+
+
+def import_legacy_entries(entries: dict):
+    """
+    Importe l'ancien non_voters.json : un compteur global par membre,
+    sans détail par sondage → une ligne poll_id='legacy' pondérée.
+    """
+    rows = [
+        (
+            "legacy",
+            int(uid),
+            entry.get("display_name"),
+            entry.get("server_name"),
+            int(entry.get("missed_votes", 0)),
+            entry.get("last_missed") or _utc_ts()
+        )
+        for uid, entry in entries.items()
+        if entry.get("missed_votes")
+    ]
+    if rows:
+        DB.write_sync(_insert_missed, rows)
+    return len(rows)
@@ -1,15 +1,64 @@
 import sqlite3
-import json
 from datetime import datetime
-from core.db import db_path
+from core.db import SQLiteManager, db_path, log_write_errors
+from core.serializer import dumps_str, loads
+from modules.polls.vote_store import VoteStore
 
 
+DB = SQLiteManager(db_path("polls.db"))
+
+# =========================================================
+# STATEMENTS (réutilisés → cache de statements sqlite3)
+# =========================================================
+
+POLL_COLUMNS = (
+    "poll_id", "guild_id", "channel_id", "message_id",
+    "question", "options", "created_by",
+    "status", "created_at", "ends_at", "alert_sent",
+    "multiple", "duration_minutes", "notify_roles", "last_notify_ts"
+)
+
+SQL_UPSERT_POLL = f"""
+    INSERT INTO polls ({", ".join(POLL_COLUMNS)})
+    VALUES ({", ".join("?" for _ in POLL_COLUMNS)})
+    ON CONFLICT(poll_id) DO UPDATE SET
+        {", ".join(f"{c} = excluded.{c}" for c in POLL_COLUMNS[1:])}
+"""
+SQL_GET_POLL = f"SELECT {', '.join(POLL_COLUMNS)} FROM polls WHERE poll_id = ?"
+SQL_OPEN_POLLS_WITH_VOTES = f"""
+    SELECT {", ".join(f"p.{c}" for c in POLL_COLUMNS)}, v.user_id, v.option
+    FROM polls p
+    LEFT JOIN votes v ON v.poll_id = p.poll_id
+    WHERE p.status = 'open'
+"""
+SQL_INSERT_VOTE = """
+    INSERT INTO votes (poll_id, user_id, option)
+    VALUES (?, ?, ?)
+"""
+SQL_INSERT_VOTE_IGNORE = """
+    INSERT OR IGNORE INTO votes (poll_id, user_id, option)
+    VALUES (?, ?, ?)
+"""
+SQL_DELETE_VOTE = """
+    DELETE FROM votes
+    WHERE poll_id = ? AND user_id = ? AND option = ?
+"""
+SQL_DELETE_POLL_VOTES = "DELETE FROM votes WHERE poll_id = ?"
+SQL_GET_VOTES = """
+    SELECT option, user_id FROM votes
+    WHERE poll_id = ?
+"""
+SQL_COUNT_VOTES = """
+    SELECT option, COUNT(*) FROM votes
+    WHERE poll_id = ?
+    GROUP BY option
+"""
+
 # =========================================================
 # DB INIT
 # =========================================================
 
-def init_db():
-    conn = sqlite3.connect(db_path("polls.db"))
+def _init_db(conn):
     cur = conn.cursor()
 
     cur.execute("""
@@ -24,10 +73,30 @@ def init_db():
             status TEXT NOT NULL,
             created_at TEXT NOT NULL,
             ends_at TEXT,
-            alert_sent INTEGER DEFAULT 0
+            alert_sent INTEGER DEFAULT 0,
+            multiple INTEGER DEFAULT 1,
+            duration_minutes INTEGER DEFAULT 0,
+            notify_roles TEXT DEFAULT '[]',
+            last_notify_ts INTEGER DEFAULT 0
         )
     """)
 
+    # bases créées avant l'unification JSON → SQLite
+    existing = {row[1] for row in cur.execute("PRAGMA table_info(polls)")}
+    for column, decl in (
+        ("multiple", "INTEGER DEFAULT 1"),
+        ("duration_minutes", "INTEGER DEFAULT 0"),
+        ("notify_roles", "TEXT DEFAULT '[]'"),
+        ("last_notify_ts", "INTEGER DEFAULT 0"),
+    ):
+        if column not in existing:
+            cur.execute(f"ALTER TABLE polls ADD COLUMN {column} {decl}")
+
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_polls_status_ends_at
+        ON polls (status, ends_at)
+    """)
+
     cur.execute("""
         CREATE TABLE IF NOT EXISTS votes (
             poll_id TEXT,
@@ -37,162 +106,346 @@ def init_db():
         )
     """)
 
-    conn.commit()
-    conn.close()
-# =========================================================
-# POLL CRUD
-# =========================================================
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS missed_votes (
+            poll_id TEXT NOT NULL,
+            user_id INTEGER NOT NULL,
+            display_name TEXT,
+            server_name TEXT,
+            missed INTEGER NOT NULL DEFAULT 1,
+            missed_at TEXT NOT NULL,
+            PRIMARY KEY (poll_id, user_id)
+        )
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_missed_votes_user
+        ON missed_votes (user_id)
+    """)
 
-def create_poll(poll: dict):
-    conn = sqlite3.connect(db_path("polls.db"))
-    cur = conn.cursor()
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS dm_jobs (
+            job_id TEXT PRIMARY KEY,
+            poll_id TEXT,
+            content TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    """)
 
     cur.execute("""
-        INSERT INTO polls (
-            poll_id, guild_id, channel_id, message_id,
-            question, options, created_by,
-            status, created_at, ends_at, alert_sent
+        CREATE TABLE IF NOT EXISTS dm_outbox (
+            job_id TEXT,
+            user_id INTEGER,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            PRIMARY KEY (job_id, user_id)
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
+    """)
+
+
+def init_db():
+    DB.write_sync(_init_db)
+
+# =========================================================
+# POLL CRUD
+# =========================================================
+
+def poll_row(poll: dict) -> tuple:
+    """
+    Ligne `polls` d'un sondage (métadonnées seules, jamais les votes).
+    """
+    return (
         poll["poll_id"],
         poll.get("guild_id"),
         poll.get("channel_id"),
         poll.get("message_id"),
         poll["question"],
-        json.dumps(poll["options"], ensure_ascii=False),
+        dumps_str(poll["options"]),
         poll["created_by"],
         poll["status"],
         poll["created_at"],
         poll.get("ends_at"),
-        int(poll.get("alert_sent", False))
-    ))
+        int(poll.get("alert_sent", False)),
+        int(poll.get("multiple", True)),
+        poll.get("duration_minutes", 0),
+        dumps_str(poll.get("notify_roles") or []),
+        poll.get("last_notify_ts", 0)
+    )
 
-    conn.commit()
-    conn.close()
 
-def get_poll(poll_id: str) -> dict | None:
-    conn = sqlite3.connect(db_path("polls.db"))
-    cur = conn.cursor()
+def _save_poll_rows(conn, rows: list[tuple]):
+    conn.executemany(SQL_UPSERT_POLL, rows)
+
+
+def save_polls(rows: list[tuple]):
+    DB.write_sync(_save_poll_rows, rows)
+
+
+async def save_polls_async(rows: list[tuple]):
+    await DB.write_async(_save_poll_rows, rows)
+
+
+def _poll_from_row(row) -> dict:
+    poll = dict(zip(POLL_COLUMNS, row))
+    poll["options"] = loads(poll["options"])
+    poll["notify_roles"] = loads(poll["notify_roles"] or "[]")
+    poll["alert_sent"] = bool(poll["alert_sent"])
+    poll["multiple"] = bool(poll["multiple"])
+    poll["last_notify_ts"] = poll["last_notify_ts"] or 0
+    return poll
 
-    cur.execute("SELECT * FROM polls WHERE poll_id = ?", (poll_id,))
-    row = cur.fetchone()
-    conn.close()
+
+def _get_poll(conn, poll_id: str) -> dict | None:
+    row = conn.execute(SQL_GET_POLL, (poll_id,)).fetchone()
 
     if not row:
         return None
 
-    return {
-        "poll_id": row[0],
-        "guild_id": row[1],
-        "channel_id": row[2],
-        "message_id": row[3],
-        "question": row[4],
-        "options": json.loads(row[5]),
-        "created_by": row[6],
-        "status": row[7],
-        "created_at": row[8],
-        "ends_at": row[9],
-        "alert_sent": bool(row[10]),
-    }
+    return _poll_from_row(row)
+
+
+def get_poll(poll_id: str) -> dict | None:
+    return DB.read(_get_poll, poll_id)
+
+
+async def get_poll_async(poll_id: str) -> dict | None:
+    return await DB.read_async(_get_poll, poll_id)
+
+
+def _import_poll(conn, poll: dict):
+    conn.execute(SQL_UPSERT_POLL, poll_row(poll))
+    conn.execute(SQL_DELETE_POLL_VOTES, (poll["poll_id"],))
+    conn.executemany(SQL_INSERT_VOTE_IGNORE, [
+        (poll["poll_id"], int(uid), option)
+        for uid, options in poll.get("votes", {}).items()
+        for option in options
+    ])
+
+
+def import_poll(poll: dict):
+    """
+    Importe un sondage complet (métadonnées + votes) en une transaction.
+    Les votes existants du sondage sont remplacés.
+    """
+    DB.write_sync(_import_poll, poll)
 
 # =========================================================
 # VOTES
 # =========================================================
 
+def _register_vote(conn, poll_id: str, user_id: int, option: str) -> bool:
+    try:
+        conn.execute(SQL_INSERT_VOTE, (poll_id, user_id, option))
+        return True
+    except sqlite3.IntegrityError:
+        return False
+
+
 def register_vote(poll_id: str, user_id: int, option: str) -> bool:
     """
     Enregistre un vote.
     Retourne False si l'utilisateur a déjà voté.
     """
-    conn = sqlite3.connect(db_path("polls.db"))
-    cur = conn.cursor()
+    return DB.write_sync(_register_vote, poll_id, user_id, option)
 
-    try:
-        cur.execute("""
-            INSERT INTO votes (poll_id, user_id, option)
-            VALUES (?, ?, ?)
-        """, (poll_id, user_id, option))
-        conn.commit()
-        return True
-    except sqlite3.IntegrityError:
-        return False
-    finally:
-        conn.close()
+
+def _get_votes(conn, poll_id: str) -> dict:
+    votes = {}
+    for option, user_id in conn.execute(SQL_GET_VOTES, (poll_id,)):
+        votes.setdefault(option, []).append(user_id)
+    return votes
 
 
 def get_votes(poll_id: str) -> dict:
     """
     Retourne les votes sous forme {option: [user_id, ...]}
     """
-    conn = sqlite3.connect(db_path("polls.db"))
-    cur = conn.cursor()
+    return DB.read(_get_votes, poll_id)
 
-    cur.execute("""
-        SELECT option, user_id FROM votes
-        WHERE poll_id = ?
-    """, (poll_id,))
 
-    votes = {}
-    for option, user_id in cur.fetchall():
-        votes.setdefault(option, []).append(user_id)
+def _get_vote_store(conn, poll_id: str, options: list) -> VoteStore:
+    return VoteStore.from_rows(options, (
+        (user_id, option)
+        for option, user_id in conn.execute(SQL_GET_VOTES, (poll_id,))
+    ))
 
-    conn.close()
-    return votes
+
+def get_vote_store(poll_id: str, options: list) -> VoteStore:
+    """
+    Retourne les votes du sondage sous forme compacte (VoteStore)
+    """
+    return DB.read(_get_vote_store, poll_id, options)
+
+
+async def get_vote_store_async(poll_id: str, options: list) -> VoteStore:
+    return await DB.read_async(_get_vote_store, poll_id, options)
+
+
+def _count_votes(conn, poll_id: str) -> dict:
+    return {
+        opt: cnt
+        for opt, cnt in conn.execute(SQL_COUNT_VOTES, (poll_id,))
+    }
 
 
 def count_votes(poll_id: str) -> dict:
     """
     Retourne {option: count}
     """
-    conn = sqlite3.connect(db_path("polls.db"))
-    cur = conn.cursor()
-
-    cur.execute("""
-        SELECT option, COUNT(*) FROM votes
-        WHERE poll_id = ?
-        GROUP BY option
-    """, (poll_id,))
-
-    counts = {opt: cnt for opt, cnt in cur.fetchall()}
-    conn.close()
-    return counts
+    return DB.read(_count_votes, poll_id)
 
 # =========================================================
 # FETCH OPEN POLLS
 # =========================================================
 
-def fetch_open_polls_with_deadline():
-    conn = sqlite3.connect(db_path("polls.db"))
-    cur = conn.cursor()
+def _fetch_open_polls(conn) -> list[dict]:
+    n = len(POLL_COLUMNS)
+    polls: dict[str, dict] = {}
+    rows: dict[str, list] = {}
 
-    cur.execute("""
-        SELECT poll_id, ends_at FROM polls
-        WHERE status = 'open' AND ends_at IS NOT NULL
-    """)
+    for row in conn.execute(SQL_OPEN_POLLS_WITH_VOTES):
+        poll_id = row[0]
+        if poll_id not in polls:
+            polls[poll_id] = _poll_from_row(row[:n])
+            rows[poll_id] = []
 
-    rows = cur.fetchall()
-    conn.close()
+        user_id, option = row[n], row[n + 1]
+        if user_id is not None:
+            rows[poll_id].append((user_id, option))
 
-    return [
-        {
-            "poll_id": poll_id,
-            "ends_at": ends_at
-        }
-        for poll_id, ends_at in rows
-    ]
+    for poll_id, poll in polls.items():
+        poll["votes"] = VoteStore.from_rows(poll["options"], rows[poll_id])
+
+    return list(polls.values())
+
+
+async def fetch_open_polls_async() -> list[dict]:
+    """
+    Tous les sondages ouverts, votes inclus, en une seule requête
+    (index polls(status, ends_at)).
+    """
+    return await DB.read_async(_fetch_open_polls)
 
 #===============
 # REMOVE_VOTE
 #===============
+def _remove_vote(conn, poll_id: str, user_id: int, option: str):
+    conn.execute(SQL_DELETE_VOTE, (poll_id, user_id, option))
+
+
 def remove_vote(poll_id: str, user_id: int, option: str):
-    conn = sqlite3.connect(db_path("polls.db"))
-    cur = conn.cursor()
+    DB.write_sync(_remove_vote, poll_id, user_id, option)
+
+#===============
+# BATCH (group commit)
+#===============
+def _apply_vote_batch(conn, ops: list[tuple]):
+    added = [(p, u, o) for p, u, o, action in ops if action == "added"]
+    removed = [(p, u, o) for p, u, o, action in ops if action == "removed"]
+
+    if removed:
+        conn.executemany(SQL_DELETE_VOTE, removed)
+    if added:
+        conn.executemany(SQL_INSERT_VOTE_IGNORE, added)
+
+
+async def apply_vote_batch_async(ops: list[tuple]):
+    """
+    Applique [(poll_id, user_id, option, action), ...] en une transaction.
+    Les opérations doivent être déjà fusionnées (une seule par vote).
+    """
+    await DB.write_async(_apply_vote_batch, ops)
+
+#===============
+# FIRE & FORGET
+#===============
+def submit_vote(poll_id: str, user_id: int, option: str, action: str):
+    """
+    Planifie l'écriture d'un vote sans attendre le commit.
+    Utilisé depuis la boucle asyncio : aucun fsync sur le chemin du clic.
+    """
+    fn = _register_vote if action == "added" else _remove_vote
+    return log_write_errors(
+        DB.write(fn, poll_id, user_id, option),
+        f"{action}:{poll_id}"
+    )
+
+# =========================================================
+# DM OUTBOX
+# =========================================================
+
+def _outbox_create(conn, job_id: str, poll_id: str, content: str, user_ids: list[int]):
+    conn.execute(
+        "INSERT INTO dm_jobs (job_id, poll_id, content, created_at) VALUES (?, ?, ?, ?)",
+        (job_id, poll_id, content, datetime.utcnow().isoformat())
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO dm_outbox (job_id, user_id) VALUES (?, ?)",
+        [(job_id, uid) for uid in user_ids]
+    )
 
-    cur.execute("""
-        DELETE FROM votes
-        WHERE poll_id = ? AND user_id = ? AND option = ?
-    """, (poll_id, user_id, option))
 
-    conn.commit()
-    conn.close()
\ No newline at end of file
+async def outbox_create_async(job_id: str, poll_id: str, content: str, user_ids: list[int]):
+    await DB.write_async(_outbox_create, job_id, poll_id, content, user_ids)
+
+
+def _outbox_mark(conn, results: list[tuple]):
+    conn.executemany("""
+        UPDATE dm_outbox
+        SET status = ?, attempts = attempts + ?, error = ?
+        WHERE job_id = ? AND user_id = ?
+    """, results)
+
+
+async def outbox_mark_async(results: list[tuple]):
+    """
+    results = [(status, attempts, error, job_id, user_id), ...]
+    """
+    await DB.write_async(_outbox_mark, results)
+
+
+def _outbox_pending(conn) -> list[dict]:
+    jobs = {}
+    for job_id, poll_id, content, user_id in conn.execute("""
+        SELECT j.job_id, j.poll_id, j.content, o.user_id
+        FROM dm_outbox o JOIN dm_jobs j ON j.job_id = o.job_id
+        WHERE o.status = 'pending'
+        ORDER BY j.created_at
+    """):
+        job = jobs.setdefault(job_id, {
+            "job_id": job_id,
+            "poll_id": poll_id,
+            "content": content,
+            "user_ids": []
+        })
+        job["user_ids"].append(user_id)
+    return list(jobs.values())
+
+
+async def outbox_pending_async() -> list[dict]:
+    return await DB.read_async(_outbox_pending)
+
+
+def _outbox_purge(conn, job_id: str | None = None) -> int:
+    # jobs sans destinataire "pending" : plus rien à reprendre
+    scope = "AND j.job_id = ?" if job_id else ""
+    params = (job_id,) if job_id else ()
+
+    done = [row[0] for row in conn.execute(f"""
+        SELECT j.job_id FROM dm_jobs j
+        WHERE NOT EXISTS (
+            SELECT 1 FROM dm_outbox o
+            WHERE o.job_id = j.job_id AND o.status = 'pending'
+        ) {scope}
+    """, params)]
+
+    conn.executemany("DELETE FROM dm_outbox WHERE job_id = ?", [(j,) for j in done])
+    conn.executemany("DELETE FROM dm_jobs WHERE job_id = ?", [(j,) for j in done])
+    return len(done)
+
+
+async def outbox_purge_async(job_id: str | None = None) -> int:
+    """
+    Supprime les jobs terminés (tous, ou seulement `job_id`) et leur outbox.
+    """
+    return await DB.write_async(_outbox_purge, job_id)
@@ -0,0 +1,107 @@
+import asyncio
+import time
+
+import discord
+
+MAX_ATTEMPTS = 3
+# 429 successifs tolérés pour un même envoi avant abandon
+MAX_RATE_LIMITS = 5
+
+
+# =========================
+# TOKEN BUCKET
+# =========================
+class TokenBucket:
+    """
+    Débit moyen `rate` jetons/s, rafale max `capacity`.
+    `pause()` vide le seau (retry-after reçu de Discord).
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                    continue
+
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0
+
+
+# =========================
+# RETRY
+# =========================
+def retry_after(e: Exception) -> float | None:
+    """
+    Délai imposé par un 429 (secondes), None si ce n'en est pas un.
+    """
+    if isinstance(e, discord.RateLimited):
+        return e.retry_after
+    if isinstance(e, discord.HTTPException) and e.status == 429:
+        try:
+            return float(e.response.headers.get("Retry-After", 1))
+        except (AttributeError, TypeError, ValueError):
+            return 1.0
+    return None
+
+
+async def send_with_retry(bucket: TokenBucket, send) -> tuple:
+    """
+    Appelle `await send()` cadencé par `bucket`.
+    429 → pause du seau et nouvel essai, jusqu'à MAX_RATE_LIMITS fois ;
+    5xx → jusqu'à MAX_ATTEMPTS essais ; Forbidden → échec immédiat.
+
+    Retourne (status, attempts, error, résultat de send).
+    """
+    attempts = 0
+    rate_limited = 0
+
+    while True:
+        await bucket.acquire()
+
+        try:
+            return "sent", attempts + 1, None, await send()
+        except discord.Forbidden as e:
+            return "failed", attempts + 1, str(e), None
+        except Exception as e:
+            delay = retry_after(e)
+            if delay is not None:
+                # on ralentit tout le monde
+                bucket.pause(delay)
+                rate_limited += 1
+                if rate_limited < MAX_RATE_LIMITS:
+                    continue
+                return "failed", attempts + 1, f"rate limited: {e}", None
+
+            attempts += 1
+            retryable = isinstance(e, discord.HTTPException) and e.status >= 500
+            if retryable and attempts < MAX_ATTEMPTS:
+                await asyncio.sleep(attempts)
+                continue
+
+            return "failed", attempts, str(e), None
@@ -0,0 +1,133 @@
+import asyncio
+
+import config
+
+from core.logger import log
+from core.metrics import METRICS
+from modules.polls.storage import load_poll_async
+
+
+EDIT_DELAY_SECONDS = METRICS.histogram(
+    "poll_embed_edit_delay_seconds",
+    "Délai entre la première demande de rafraîchissement et l'édition"
+)
+EDITS = METRICS.counter(
+    "poll_embed_edits_total",
+    "Éditions d'embed par résultat",
+    ("result",)
+)
+
+# =========================
+# EMBED REFRESH COORDINATOR
+# =========================
+class EmbedRefresher:
+    """
+    Point unique d'édition des messages de sondage.
+
+    `request()` marque le sondage comme "dirty". Le premier appel édite
+    immédiatement, les suivants sont fusionnés : au plus une édition par
+    sondage et par fenêtre, toujours rendue depuis l'état le plus récent.
+    Votes, minuteur et fermeture passent tous par ici, donc jamais deux
+    éditions concurrentes du même message. Si l'empreinte du rendu n'a
+    pas changé depuis la dernière édition, aucun appel REST n'est fait.
+    """
+
+    def __init__(self, window_seconds: float):
+        self.window = window_seconds
+
+        self._dirty: set[str] = set()
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._last_edit: dict[str, float] = {}
+        self._fingerprints: dict[str, int] = {}
+        # première demande non servie, pour la latence ack → édition
+        self._requested_at: dict[str, float] = {}
+
+    def last_fingerprint(self, poll_id: str) -> int | None:
+        return self._fingerprints.get(poll_id)
+
+    async def settle(self, poll_id: str):
+        """
+        Attend la fin des éditions en cours pour ce sondage (avant archivage :
+        une édition tardive le rechargerait dans le cache).
+        """
+        task = self._tasks.get(poll_id)
+        if task is not None:
+            await asyncio.wait([task])
+
+    def request(self, client, poll_id: str):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            log(f"POLL refresh skipped (no loop): {poll_id}", "ERROR")
+            return
+
+        self._dirty.add(poll_id)
+        self._requested_at.setdefault(poll_id, loop.time())
+
+        if poll_id in self._tasks:
+            return
+
+        self._tasks[poll_id] = loop.create_task(self._worker(client, poll_id))
+
+    async def _worker(self, client, poll_id: str):
+        loop = asyncio.get_running_loop()
+
+        try:
+            while poll_id in self._dirty:
+                last = self._last_edit.get(poll_id)
+                if last is not None:
+                    wait = last + self.window - loop.time()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+
+                self._dirty.discard(poll_id)
+                requested_at = self._requested_at.pop(poll_id, None)
+                edited, closed = await self._edit(client, poll_id)
+                if edited:
+                    self._last_edit[poll_id] = loop.time()
+                    if requested_at is not None:
+                        EDIT_DELAY_SECONDS.observe(loop.time() - requested_at)
+
+                if closed:
+                    self._dirty.discard(poll_id)
+                    self._requested_at.pop(poll_id, None)
+                    self._last_edit.pop(poll_id, None)
+                    self._fingerprints.pop(poll_id, None)
+                    break
+        finally:
+            self._tasks.pop(poll_id, None)
+
+    async def _edit(self, client, poll_id: str) -> tuple[bool, bool]:
+        from modules.polls.ui import build_poll_embed, render_fingerprint, PollView
+
+        poll = await load_poll_async(poll_id)
+        if not poll or not poll.get("channel_id") or not poll.get("message_id"):
+            return False, True
+
+        is_open = poll["status"] == "open"
+
+        fingerprint = render_fingerprint(poll)
+        if fingerprint == self._fingerprints.get(poll_id):
+            EDITS.inc(result="skipped")
+            return False, not is_open
+
+        try:
+            message = client.get_partial_messageable(
+                poll["channel_id"]
+            ).get_partial_message(poll["message_id"])
+
+            await message.edit(
+                embed=build_poll_embed(poll),
+                view=PollView(poll) if is_open else None
+            )
+        except Exception as e:
+            log(f"POLL embed refresh failed id={poll_id}: {e}", "ERROR")
+            EDITS.inc(result="failed")
+            return False, not is_open
+
+        EDITS.inc(result="edited")
+        self._fingerprints[poll_id] = fingerprint
+        return True, not is_open
+
+
+REFRESHER = EmbedRefresher(config.POLL_EMBED_REFRESH_SECONDS)
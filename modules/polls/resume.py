@@ -1,27 +1,36 @@
-import os
-from modules.polls.storage import ACTIVE_DIR, load_poll
-from modules.polls.ui import PollView
-from core.logger import log
+import time
 
+from modules.polls.polls_db import fetch_open_polls_async
+from modules.polls.scheduler import TIMERS, schedule_poll_jobs
+from modules.polls.storage import prime_polls
+from modules.polls.ui import register_poll_router
+from core.logger import log
 
-async def resume_poll_views(bot):
-    if not os.path.exists(ACTIVE_DIR):
-        log("POLL resume views: no active dir", "POLL")
-        return
 
-    restored = 0
+async def resume_polls(bot):
+    """
+    Reprise au démarrage en une passe : une requête SQLite charge tous les
+    sondages ouverts (votes inclus), puis les jobs sont replanifiés depuis
+    ce snapshot en mémoire. Les boutons passent par le routeur dynamique,
+    enregistré une fois quel que soit le nombre de sondages.
+    """
+    started = time.perf_counter()
 
-    for file in os.listdir(ACTIVE_DIR):
-        if not file.endswith(".json"):
-            continue
+    register_poll_router(bot)
 
-        poll_id = file.replace("poll_", "").replace(".json", "")
-        poll = load_poll(poll_id)
+    polls = await fetch_open_polls_async()
+    prime_polls(polls)
 
-        if not poll or poll.get("status") != "open":
-            continue
+    TIMERS.start(bot)
 
-        bot.add_view(PollView(poll))
-        restored += 1
+    for poll in polls:
+        schedule_poll_jobs(poll)
 
-    log(f"POLL resume views: {restored} poll(s) restored", "POLL")
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    log(
+        f"POLL resume: {len(polls)} open poll(s) restored in {elapsed_ms:.0f}ms",
+        "POLL",
+        module="polls",
+        event="resume",
+        duration_ms=round(elapsed_ms, 1)
+    )
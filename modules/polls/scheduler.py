@@ -1,9 +1,18 @@
 import asyncio
 import datetime
+import heapq
+import itertools
+import time
 import discord
 
 from core.logger import log
-from modules.polls.storage import load_poll, save_poll
+from core.metrics import METRICS
+from modules.polls.manager import archive_poll_async
+from modules.polls.storage import load_poll_async, poll_transaction
+from modules.polls.refresh import REFRESHER
+from modules.polls.absentees import find_missing_voters
+from modules.polls.dm_dispatch import DISPATCHER
+from modules.polls.announce import ANNOUNCER
 import config
 
 
@@ -29,6 +38,107 @@ def safe_create_task(coro, name: str):
     loop.create_task(wrapper())
 
 
+# =========================
+# TIMER WHEEL
+# =========================
+TIMER_REFRESH_SECONDS = 60
+
+
+def seconds_until(iso_ts: str) -> float:
+    target = datetime.datetime.fromisoformat(iso_ts)
+    return (target - datetime.datetime.utcnow()).total_seconds()
+
+
+class PollTimers:
+    """
+    Service unique de planification des jobs de sondage.
+
+    Un tas de (échéance, seq, poll_id, kind) et une seule tâche dormeuse.
+    Une entrée par (poll_id, kind) : replanifier remplace l'ancienne
+    échéance (les entrées périmées du tas sont ignorées puis compactées).
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[float, int, str, str]] = []
+        self._entries: dict[tuple[str, str], int] = {}
+        self._seq = itertools.count()
+
+        self._jobs: dict[str, object] = {}
+        self._client = None
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def register(self, kind: str, job):
+        self._jobs[kind] = job
+
+    def start(self, client):
+        self._client = client
+        if self._task and not self._task.done():
+            return
+        self._wake = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def schedule(self, poll_id: str, kind: str, delay_seconds: float):
+        seq = next(self._seq)
+        due = time.time() + max(0.0, delay_seconds)
+
+        self._entries[(poll_id, kind)] = seq
+        heapq.heappush(self._heap, (due, seq, poll_id, kind))
+
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._compact()
+
+        if self._wake:
+            self._wake.set()
+
+    def cancel(self, poll_id: str, kind: str | None = None):
+        for k in [kind] if kind else list(self._jobs):
+            self._entries.pop((poll_id, k), None)
+
+    def _compact(self):
+        self._heap = [
+            item for item in self._heap
+            if self._entries.get((item[2], item[3])) == item[1]
+        ]
+        heapq.heapify(self._heap)
+
+    def _is_live(self, item) -> bool:
+        return self._entries.get((item[2], item[3])) == item[1]
+
+    async def _run(self):
+        while True:
+            while self._heap and not self._is_live(self._heap[0]):
+                heapq.heappop(self._heap)
+
+            timeout = self._heap[0][0] - time.time() if self._heap else None
+
+            if timeout is None or timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                continue
+
+            _, _, poll_id, kind = heapq.heappop(self._heap)
+            del self._entries[(poll_id, kind)]
+
+            job = self._jobs.get(kind)
+            if job:
+                safe_create_task(job(self._client, poll_id), f"{kind}:{poll_id}")
+
+
+TIMERS = PollTimers()
+
+METRICS.gauge(
+    "poll_timer_queue_depth",
+    "Jobs de sondage planifiés (close / alert / refresh)"
+).set_function(lambda: len(TIMERS))
+
+
 # =========================
 # CORE CLOSE
 # =========================
@@ -37,105 +147,84 @@ async def close_poll_and_process(
     poll_id: str,
     reason: str = "auto"
 ):
-    poll = load_poll(poll_id)
-    if not poll or poll["status"] != "open":
-        return
+    async with poll_transaction(poll_id) as poll:
+        if not poll or poll["status"] != "open":
+            return
 
-    poll["status"] = "closed"
-    save_poll(poll)
+        poll["status"] = "closed"
+
+    TIMERS.cancel(poll_id)
+    REFRESHER.request(client, poll_id)
 
     await notify_missing_voters_on_close(client, poll_id, reason)
 
-    log(f"POLL closed id={poll_id} reason={reason}", "POLL")
+    # dernier rendu fait, puis hors du cache : archive + éviction
+    await REFRESHER.settle(poll_id)
+    await archive_poll_async(poll_id)
+
+    log(
+        f"POLL closed id={poll_id} reason={reason}",
+        "POLL",
+        module="polls",
+        poll_id=poll_id,
+        event="close"
+    )
 
 
 # =========================
 # AUTO CLOSE
 # =========================
 async def auto_close_poll(client: discord.Client, poll_id: str):
-    poll = load_poll(poll_id)
-    if not poll or not poll.get("ends_at"):
+    poll = await load_poll_async(poll_id)
+    if not poll or poll["status"] != "open" or not poll.get("ends_at"):
         return
 
-    ends_at = datetime.datetime.fromisoformat(poll["ends_at"])
-    delay = (ends_at - datetime.datetime.utcnow()).total_seconds()
-
+    delay = seconds_until(poll["ends_at"])
     if delay > 0:
-        await asyncio.sleep(delay)
-
-    poll = load_poll(poll_id)
-    if not poll or poll["status"] != "open":
+        # échéance repoussée entre-temps
+        TIMERS.schedule(poll_id, "close", delay)
         return
 
     await close_poll_and_process(client, poll_id, "auto")
 
-    poll = load_poll(poll_id)
-    if not poll:
-        return
-
-    try:
-        from modules.polls.ui import build_poll_embed
-
-        channel = client.get_channel(poll["channel_id"])
-        if not channel:
-            return
-
-        message = await channel.fetch_message(poll["message_id"])
-        await message.edit(
-            embed=build_poll_embed(poll),
-            view=None
-        )
-    except Exception as e:
-        log(f"POLL close edit failed: {e}", "ERROR")
-
 
 # =========================
 # TIMER REFRESH
 # =========================
 async def auto_update_poll_timer(
     client: discord.Client,
-    poll_id: str,
-    refresh_minutes: int
+    poll_id: str
 ):
-    refresh_seconds = refresh_minutes * 60
-
-    while True:
-        poll = load_poll(poll_id)
-        if (
-            not poll
-            or poll["status"] != "open"
-            or not poll.get("ends_at")
-        ):
-            return
+    poll = await load_poll_async(poll_id)
+    if (
+        not poll
+        or poll["status"] != "open"
+        or not poll.get("ends_at")
+    ):
+        return
 
-        ends_at = datetime.datetime.fromisoformat(poll["ends_at"])
-        remaining = (ends_at - datetime.datetime.utcnow()).total_seconds()
+    remaining = seconds_until(poll["ends_at"])
 
-        if remaining <= refresh_seconds:
-            return
+    if remaining <= TIMER_REFRESH_SECONDS:
+        return
 
-        try:
-            from modules.polls.ui import build_poll_embed, PollView
-
-            channel = client.get_channel(poll["channel_id"])
-            if not channel:
-                return
-
-            message = await channel.fetch_message(poll["message_id"])
-            await message.edit(
-                embed=build_poll_embed(poll),
-                view=PollView(poll)
-            )
-
-            log(
-                f"POLL timer refresh id={poll_id} "
-                f"remaining={int(remaining // 60)}min",
-                "POLL"
-            )
-        except Exception as e:
-            log(f"POLL timer refresh failed: {e}", "ERROR")
+    TIMERS.schedule(poll_id, "refresh", TIMER_REFRESH_SECONDS)
+
+    # le rendu n'affiche que jours/heures : la plupart des ticks ne changent rien
+    from modules.polls.ui import render_fingerprint
+    if render_fingerprint(poll) == REFRESHER.last_fingerprint(poll_id):
+        return
 
-        await asyncio.sleep(refresh_seconds)
+    REFRESHER.request(client, poll_id)
+
+    log(
+        f"POLL timer refresh id={poll_id} "
+        f"remaining={int(remaining // 60)}min",
+        "POLL",
+        module="polls",
+        poll_id=poll_id,
+        event="timer_refresh"
+    )
 
 
 # =========================
@@ -146,7 +235,7 @@ async def notify_missing_voters_on_close(
     poll_id: str,
     reason: str
 ):
-    poll = load_poll(poll_id)
+    poll = await load_poll_async(poll_id)
     if not poll or not poll.get("notify_roles"):
         return
 
@@ -154,18 +243,10 @@ async def notify_missing_voters_on_close(
     if not guild:
         return
 
-    voters = set(poll["votes"].keys())
-
-    missing = [
-        m for m in guild.members
-        if any(r.id in poll["notify_roles"] for r in m.roles)
-        and str(m.id) not in voters
-        and not m.bot
-    ]
+    missing = find_missing_voters(guild, poll)
 
-    from modules.polls.non_voters import register_missed_vote
-    for m in missing:
-        register_missed_vote(m, guild)
+    from modules.polls.non_voters import register_missed_votes_async
+    await register_missed_votes_async(missing, guild, poll_id)
 
     if not missing:
         return
@@ -178,110 +259,104 @@ async def notify_missing_voters_on_close(
     if not channel:
         return
 
-    try:
-        mentions = " ".join(m.mention for m in missing)
-
-        await channel.send(
-            f"🛑 **Sondage terminé — votes manquants**\n"
-            f"**{poll['question']}**\n\n"
-            f"👤 **Absents :**\n{mentions}"
+    report = await ANNOUNCER.send(
+        channel,
+        f"🛑 **Sondage terminé — votes manquants**\n"
+        f"**{poll['question']}**\n\n"
+        f"👤 **Absents :**",
+        [m.mention for m in missing]
+    )
+    if not report.ok:
+        log(
+            f"POLL missing voters partially sent id={poll_id} "
+            f"chunks_failed={report.failed}",
+            "ERROR"
         )
-    except Exception as e:
-        log(f"POLL missing voters send failed: {e}", "ERROR")
 
 # =========================
 # ALERT 25%
 # =========================
-async def alert_unvoted_members(
-    client: discord.Client,
-    poll_id: str
-):
-    poll = load_poll(poll_id)
-    if not poll or poll["alert_sent"]:
-        return
-
-    if not poll.get("ends_at") or not poll.get("notify_roles"):
-        return
-
+def alert_delay(poll: dict) -> float:
     created_at = datetime.datetime.fromisoformat(poll["created_at"])
     ends_at = datetime.datetime.fromisoformat(poll["ends_at"])
 
     total = (ends_at - created_at).total_seconds()
     alert_at = ends_at - datetime.timedelta(seconds=total * 0.25)
 
-    delay = (alert_at - datetime.datetime.utcnow()).total_seconds()
-    if delay > 0:
-        await asyncio.sleep(delay)
+    return (alert_at - datetime.datetime.utcnow()).total_seconds()
 
-    poll = load_poll(poll_id)
-    if not poll or poll["status"] != "open" or poll["alert_sent"]:
-        return
 
-    guild = client.get_guild(poll["guild_id"])
-    if not guild:
-        return
+async def alert_unvoted_members(
+    client: discord.Client,
+    poll_id: str
+):
+    async with poll_transaction(poll_id) as poll:
+        if not poll or poll["status"] != "open" or poll["alert_sent"]:
+            return
+
+        if not poll.get("ends_at") or not poll.get("notify_roles"):
+            return
+
+        delay = alert_delay(poll)
+        if delay > 0:
+            TIMERS.schedule(poll_id, "alert", delay)
+            return
 
-    voters = set(poll["votes"].keys())
+        guild = client.get_guild(poll["guild_id"])
+        if not guild:
+            return
 
-    targets = [
-        m for m in guild.members
-        if any(r.id in poll["notify_roles"] for r in m.roles)
-        and str(m.id) not in voters
-        and not m.bot
-    ]
+        targets = find_missing_voters(guild, poll)
 
-    if not targets:
-        return
+        if not targets:
+            return
+
+        # réservé sous verrou, avant les envois : une seule alerte par sondage
+        poll["alert_sent"] = True
 
     try:
         channel = client.get_channel(poll["channel_id"])
-        mentions = " ".join(m.mention for m in targets)
 
-        await channel.send(
-            f"⏰ **Rappel sondage** — il reste peu de temps pour voter !\n{mentions}"
+        await ANNOUNCER.send(
+            channel,
+            "⏰ **Rappel sondage** — il reste peu de temps pour voter !",
+            [m.mention for m in targets]
         )
 
-        for m in targets:
-            try:
-                await m.send(
-                    f"⏰ **Rappel sondage**\n"
-                    f"Il reste peu de temps pour voter sur :\n"
-                    f"**{poll['question']}**"
-                )
-            except Exception:
-                pass
+        await DISPATCHER.start_job(
+            client,
+            poll_id,
+            [m.id for m in targets],
+            f"⏰ **Rappel sondage**\n"
+            f"Il reste peu de temps pour voter sur :\n"
+            f"**{poll['question']}**"
+        )
     except Exception as e:
         log(f"POLL alert failed: {e}", "ERROR")
 
-    poll["alert_sent"] = True
-    save_poll(poll)
-
-from modules.polls.polls_db import fetch_open_polls_with_deadline
-from modules.polls.scheduler import (
-    auto_close_poll,
-    alert_unvoted_members,
-    auto_update_poll_timer,
-)
-
-
-
-async def resume_open_polls(client):
-    polls = fetch_open_polls_with_deadline()
+TIMERS.register("close", auto_close_poll)
+TIMERS.register("alert", alert_unvoted_members)
+TIMERS.register("refresh", auto_update_poll_timer)
 
-    for poll in polls:
-        pid = poll["poll_id"]
 
-        safe_create_task(
-            auto_close_poll(client, pid),
-            f"auto_close:{pid}"
-        )
+# =========================
+# SCHEDULING
+# =========================
+def schedule_poll_jobs(poll: dict):
+    """
+    (Re)planifie close / alert / refresh d'un sondage. Idempotent :
+    appeler deux fois remplace les échéances au lieu de les dupliquer.
+    """
+    pid = poll["poll_id"]
+
+    if poll["status"] != "open" or not poll.get("ends_at"):
+        TIMERS.cancel(pid)
+        return
 
-        safe_create_task(
-            alert_unvoted_members(client, pid),
-            f"alert:{pid}"
-        )
+    TIMERS.schedule(pid, "close", seconds_until(poll["ends_at"]))
+    TIMERS.schedule(pid, "refresh", 0)
 
-        safe_create_task(
-            auto_update_poll_timer(client, pid, 1),
-            f"refresh:{pid}"
-        )
+    if poll.get("alert_sent") or not poll.get("notify_roles"):
+        TIMERS.cancel(pid, "alert")
+    else:
+        TIMERS.schedule(pid, "alert", alert_delay(poll))
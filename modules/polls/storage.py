@@ -1,24 +1,182 @@
-import json
-import os
-import threading
+import asyncio
+import contextlib
+import weakref
 
-LOCK = threading.Lock()
+from core.logger import log
+from core.metrics import METRICS
+from modules.polls import polls_db
 
+# Ancien stockage JSON, lu uniquement par la migration
 ACTIVE_DIR = "data/polls/active"
 
-def poll_path(poll_id: str) -> str:
-    return os.path.join(ACTIVE_DIR, f"poll_{poll_id}.json")
+# =========================
+# CACHE (write-back)
+# =========================
+# Dépôt unique des sondages : SQLite est la seule source de vérité.
+# poll_id -> poll dict résident ; les lectures sont servies depuis la RAM,
+# les écritures de métadonnées marquent le sondage "dirty" et sont flushées
+# en tâche de fond. Les votes ne passent jamais par ici : ils sont écrits
+# une seule fois via le vote pipeline.
+_CACHE: dict[str, dict] = {}
+_DIRTY: set[str] = set()
 
+STORAGE_SECONDS = METRICS.histogram(
+    "poll_storage_seconds",
+    "Chargement (cache miss) et flush des sondages",
+    ("op",)
+)
+
+# Un verrou asyncio par sondage, libéré dès qu'il n'est plus référencé
+_LOCKS: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def _read_poll(poll_id: str):
+    poll = polls_db.get_poll(poll_id)
+    if poll is None:
+        return None
+    poll["votes"] = polls_db.get_vote_store(poll_id, poll["options"])
+    return poll
+
+
+def _take_dirty(poll_ids=None) -> list[tuple]:
+    targets = list(_DIRTY) if poll_ids is None else [
+        pid for pid in poll_ids if pid in _DIRTY
+    ]
+
+    rows = []
+    for poll_id in targets:
+        _DIRTY.discard(poll_id)
+        poll = _CACHE.get(poll_id)
+        if poll is not None:
+            rows.append(polls_db.poll_row(poll))
+    return rows
+
+
+# =========================
+# PUBLIC API
+# =========================
 def save_poll(data: dict):
-    os.makedirs(ACTIVE_DIR, exist_ok=True)
-    with LOCK:
-        with open(poll_path(data["poll_id"]), "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+    poll_id = data["poll_id"]
+    _CACHE[poll_id] = data
+    _DIRTY.add(poll_id)
+
 
 def load_poll(poll_id: str):
-    path = poll_path(poll_id)
-    if not os.path.exists(path):
-        return None
-    with LOCK:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+    poll = _CACHE.get(poll_id)
+    if poll is not None:
+        return poll
+
+    with STORAGE_SECONDS.time(op="load"):
+        poll = _read_poll(poll_id)
+    if poll is not None:
+        _CACHE[poll_id] = poll
+    return poll
+
+
+async def load_poll_async(poll_id: str):
+    poll = _CACHE.get(poll_id)
+    if poll is not None:
+        return poll
+
+    with STORAGE_SECONDS.time(op="load"):
+        poll = await polls_db.get_poll_async(poll_id)
+        if poll is None:
+            return None
+        poll["votes"] = await polls_db.get_vote_store_async(poll_id, poll["options"])
+
+    # un load_poll synchrone a pu remplir le cache pendant la lecture
+    return _CACHE.setdefault(poll_id, poll)
+
+
+# =========================
+# TRANSACTIONS
+# =========================
+def poll_lock(poll_id: str) -> asyncio.Lock:
+    lock = _LOCKS.get(poll_id)
+    if lock is None:
+        lock = _LOCKS[poll_id] = asyncio.Lock()
+    return lock
+
+
+@contextlib.asynccontextmanager
+async def poll_transaction(poll_id: str):
+    """
+    Lire-modifier-écrire d'un sondage sous son propre verrou :
+
+        async with poll_transaction(poll_id) as poll:
+            if poll: poll["status"] = "closed"
+
+    Cède le sondage (ou None). À la sortie sans erreur, il est marqué
+    dirty seulement si sa ligne `polls` a changé : les lectures seules
+    (vote refusé, sondage fermé…) et les votes, écrits par le pipeline,
+    ne déclenchent aucun upsert. Les sondages différents ne se bloquent
+    jamais entre eux.
+    """
+    async with poll_lock(poll_id):
+        poll = await load_poll_async(poll_id)
+        before = polls_db.poll_row(poll) if poll is not None else None
+        yield poll
+
+        # pas de réinsertion si le sondage a été archivé entre-temps
+        if (
+            poll is not None
+            and _CACHE.get(poll_id) is poll
+            and polls_db.poll_row(poll) != before
+        ):
+            save_poll(poll)
+
+
+def prime_polls(polls: list[dict]):
+    """
+    Charge un snapshot (démarrage) dans le cache sans le marquer dirty.
+    """
+    for poll in polls:
+        _CACHE.setdefault(poll["poll_id"], poll)
+
+
+def flush_polls(poll_ids=None) -> int:
+    """
+    Écrit immédiatement (synchrone) les métadonnées modifiées.
+    Utilisé à l'arrêt du bot et avant un archivage.
+    """
+    rows = _take_dirty(poll_ids)
+    if rows:
+        with STORAGE_SECONDS.time(op="flush"):
+            polls_db.save_polls(rows)
+    return len(rows)
+
+
+async def flush_polls_async(poll_ids=None) -> int:
+    rows = _take_dirty(poll_ids)
+    if rows:
+        with STORAGE_SECONDS.time(op="flush"):
+            await polls_db.save_polls_async(rows)
+    return len(rows)
+
+
+def evict_poll(poll_id: str):
+    flush_polls([poll_id])
+    _CACHE.pop(poll_id, None)
+
+
+async def evict_poll_async(poll_id: str):
+    await flush_polls_async([poll_id])
+    _CACHE.pop(poll_id, None)
+
+
+async def run_flusher(interval_seconds: float):
+    while True:
+        await asyncio.sleep(interval_seconds)
+
+        rows = _take_dirty()
+        if not rows:
+            continue
+
+        try:
+            with STORAGE_SECONDS.time(op="flush"):
+                await polls_db.save_polls_async(rows)
+        except Exception as e:
+            _DIRTY.update(row[0] for row in rows)
+            log(f"POLL cache flush failed: {e}", "ERROR")
@@ -9,17 +9,23 @@ from ui.embed_factory import (
 )
 
 from modules.polls.manager import compute_results
-from modules.polls.storage import load_poll, save_poll
-from modules.polls.scheduler import (
-    auto_close_poll,
-    auto_update_poll_timer,
-    alert_unvoted_members,
-    safe_create_task
-)
+from modules.polls.refresh import REFRESHER
+from modules.polls.absentees import ABSENTEES, find_missing_voters
+from modules.polls.announce import ANNOUNCER
+from modules.polls.dm_dispatch import DISPATCHER
+from modules.polls.storage import load_poll_async, poll_transaction
+from modules.polls.scheduler import schedule_poll_jobs
 
 import config
 
 from core.logger import module_log
+from core.metrics import METRICS
+
+VOTE_ACK_SECONDS = METRICS.histogram(
+    "poll_vote_ack_seconds",
+    "Clic de vote → réponse envoyée",
+    ("status",)
+)
 
 COLOR_OPEN = 0x3498db    # bleu
 COLOR_CLOSED = 0x95a5a6  # gris
@@ -34,6 +40,48 @@ def vote_bar(count: int, max_count: int, size: int = 10) -> str:
     return "█" * filled + "░" * (size - filled)
 
 
+# =========================
+# DEADLINE DISPLAY
+# =========================
+def deadline_text(poll: dict) -> str:
+    if not poll.get("ends_at"):
+        return "Aucune"
+
+    ends_at = datetime.datetime.fromisoformat(poll["ends_at"])
+    remaining = ends_at - datetime.datetime.utcnow()
+    seconds = int(remaining.total_seconds())
+
+    if seconds <= 0:
+        return "Terminé"
+
+    days = seconds // 86400
+    hours = (seconds % 86400) // 3600
+    if days > 0:
+        return f"{days} jour(s) {hours}h restantes"
+    return f"{hours}h restantes"
+
+
+# =========================
+# RENDER FINGERPRINT
+# =========================
+def render_fingerprint(poll: dict) -> int:
+    """
+    Empreinte de tout ce qui est visible dans l'embed et la vue.
+    Deux empreintes égales → édition Discord inutile.
+    """
+    results = compute_results(poll)
+    return hash((
+        poll["question"],
+        poll["status"],
+        bool(poll.get("multiple", False)),
+        bool(poll.get("ends_at")),
+        tuple(poll["options"]),
+        tuple(results.get(opt, 0) for opt in poll["options"]),
+        poll["votes"].voter_count,
+        deadline_text(poll),
+    ))
+
+
 # =========================
 # EMBED BUILDER
 # =========================
@@ -68,27 +116,7 @@ def build_poll_embed(poll: dict) -> discord.Embed:
         text=f"Sauron • Observation active | ID : {poll['poll_id']}"
     )
 
-    # =========================
-    # DEADLINE DISPLAY
-    # =========================
-    if poll.get("ends_at"):
-        ends_at = datetime.datetime.fromisoformat(poll["ends_at"])
-        remaining = ends_at - datetime.datetime.utcnow()
-        seconds = int(remaining.total_seconds())
-
-        if seconds <= 0:
-            deadline = "Terminé"
-        else:
-            days = seconds // 86400
-            hours = (seconds % 86400) // 3600
-            if days > 0:
-                deadline = f"{days} jour(s) {hours}h restantes"
-            else:
-                deadline = f"{hours}h restantes"
-    else:
-        deadline = "Aucune"
-
-    embed.add_field(name="⏱️ Deadline", value=deadline, inline=True)
+    embed.add_field(name="⏱️ Deadline", value=deadline_text(poll), inline=True)
     embed.add_field(
         name="📌 Statut",
         value="Ouvert" if poll["status"] == "open" else "Fermé",
@@ -96,7 +124,7 @@ def build_poll_embed(poll: dict) -> discord.Embed:
     )
     embed.add_field(
         name="👥 Participation",
-        value=f"{len(poll['votes'])} votant(s)",
+        value=f"{poll['votes'].voter_count} votant(s)",
         inline=False
     )
     embed.set_footer(text=f"ID du sondage : {poll['poll_id']}")
@@ -106,50 +134,82 @@ def build_poll_embed(poll: dict) -> discord.Embed:
 # =========================
 # BUTTONS
 # =========================
-class PollButton(discord.ui.Button):
+# Boutons dynamiques : discord.py route chaque clic d'après le préfixe du
+# custom_id (template) et instancie le bouton à la volée. Aucune vue n'est
+# gardée en mémoire par sondage ouvert.
+class PollButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"poll_vote:(?P<poll_id>[^:]+):(?P<option>.+)"
+):
     def __init__(self, poll_id: str, option: str):
-        super().__init__(label=option, style=discord.ButtonStyle.primary, custom_id=f"poll_vote:{poll_id}:{option}")
+        super().__init__(
+            discord.ui.Button(
+                label=option,
+                style=discord.ButtonStyle.primary,
+                custom_id=f"poll_vote:{poll_id}:{option}"
+            )
+        )
         self.poll_id = poll_id
         self.option = option
 
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["poll_id"], match["option"])
+
     async def callback(self, interaction: discord.Interaction):
+        start = time.perf_counter()
+        status = await self._vote(interaction)
+        VOTE_ACK_SECONDS.observe(time.perf_counter() - start, status=status)
+
+        if status == "ok":
+            REFRESHER.request(interaction.client, self.poll_id)
+
+    async def _vote(self, interaction: discord.Interaction) -> str:
         from modules.polls.manager import register_vote
 
-        poll, status, action = register_vote(
+        poll, status, action = await register_vote(
             self.poll_id, interaction.user.id, self.option
         )
 
-        if status != "ok":
-            return await interaction.response.send_message(
+        if status == "invalid":
+            await interaction.response.send_message(
+                "❌ Choix inconnu", ephemeral=True
+            )
+        elif status != "ok":
+            await interaction.response.send_message(
                 "🔒 Ce sondage est fermé", ephemeral=True
             )
+        else:
+            await interaction.response.send_message(
+                "🗑️ Vote supprimé" if action == "removed"
+                else f"✅ Vote enregistré : **{self.option}**",
+                ephemeral=True
+            )
 
-       
-        await interaction.response.send_message(
-            "🗑️ Vote supprimé" if action == "removed"
-            else f"✅ Vote enregistré : **{self.option}**",
-            ephemeral=True
-        )
-
-        poll = load_poll(self.poll_id)
-        await interaction.message.edit(
-            embed=build_poll_embed(poll),
-            view=PollView(poll)
-        )
+        return status
 
 
-class PollTimerButton(discord.ui.Button):
+class PollTimerButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"poll_timer:(?P<poll_id>[^:]+)"
+):
     def __init__(self, poll: dict):
         super().__init__(
-            label="⏱️ Modifier la durée" if poll.get("ends_at")
-            else "⏱️ Définir une durée",
-            style=discord.ButtonStyle.secondary,
-            custom_id=f"poll_timer:{poll['poll_id']}"
-)
+            discord.ui.Button(
+                label="⏱️ Modifier la durée" if poll.get("ends_at")
+                else "⏱️ Définir une durée",
+                style=discord.ButtonStyle.secondary,
+                custom_id=f"poll_timer:{poll['poll_id']}"
+            )
+        )
         self.poll_id = poll["poll_id"]
 
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls({"poll_id": match["poll_id"]})
+
     async def callback(self, interaction: discord.Interaction):
-        poll = load_poll(self.poll_id)
+        poll = await load_poll_async(self.poll_id)
         if not poll or interaction.user.id != poll["created_by"]:
             return await interaction.response.send_message(
                 "❌ Réservé au créateur", ephemeral=True
@@ -160,177 +220,200 @@ class PollTimerButton(discord.ui.Button):
         )
 
 
-class PollNotifyAbsentsButton(discord.ui.Button):
+class PollNotifyAbsentsButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"poll_notify_absents:(?P<poll_id>[^:]+)"
+):
     def __init__(self, poll: dict):
         super().__init__(
-            label="📣 Notifier les absents",
-            style=discord.ButtonStyle.danger,
-            custom_id=f"poll_notify_absents:{poll['poll_id']}"
+            discord.ui.Button(
+                label="📣 Notifier les absents",
+                style=discord.ButtonStyle.danger,
+                custom_id=f"poll_notify_absents:{poll['poll_id']}"
+            )
         )
         self.poll_id = poll["poll_id"]
 
-    async def callback(self, interaction: discord.Interaction):
-        poll = load_poll(self.poll_id)
-        if not poll or poll["status"] != "open":
-            return await interaction.response.send_message(
-                "❌ Sondage fermé ou introuvable.",
-                ephemeral=True
-            )
-
-        member = interaction.guild.get_member(interaction.user.id)
-        is_admin = any(
-            r.id in config.ADMIN_ROLE_IDS for r in member.roles
-        )
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls({"poll_id": match["poll_id"]})
 
-        if interaction.user.id != poll["created_by"] and not is_admin:
-            return await interaction.response.send_message(
-                "❌ Action réservée au créateur ou aux admins.",
-                ephemeral=True
+    async def callback(self, interaction: discord.Interaction):
+        async with poll_transaction(self.poll_id) as poll:
+            if not poll or poll["status"] != "open":
+                return await interaction.response.send_message(
+                    "❌ Sondage fermé ou introuvable.",
+                    ephemeral=True
+                )
+
+            member = interaction.guild.get_member(interaction.user.id)
+            is_admin = any(
+                r.id in config.ADMIN_ROLE_IDS for r in member.roles
             )
 
-        now = int(time.time())
-        last = poll.get("last_notify_ts", 0)
-        cooldown = getattr(config, "POLL_NOTIFY_COOLDOWN_SECONDS", 600)
+            if interaction.user.id != poll["created_by"] and not is_admin:
+                return await interaction.response.send_message(
+                    "❌ Action réservée au créateur ou aux admins.",
+                    ephemeral=True
+                )
 
-        if now - last < cooldown:
-            remaining = cooldown - (now - last)
-            return await interaction.response.send_message(
-                f"⏳ Cooldown actif ({remaining}s restantes).",
-                ephemeral=True
-            )
-
-        voters = set(poll["votes"].keys())
-        targets = [
-            m for m in interaction.guild.members
-            if any(r.id in poll.get("notify_roles", []) for r in m.roles)
-            and str(m.id) not in voters
-            and not m.bot
-        ]
+            now = int(time.time())
+            last = poll.get("last_notify_ts", 0)
+            cooldown = getattr(config, "POLL_NOTIFY_COOLDOWN_SECONDS", 600)
 
-        if not targets:
-            return await interaction.response.send_message(
-                "✅ Tout le monde a voté.",
-                ephemeral=True
-            )
+            if now - last < cooldown:
+                remaining = cooldown - (now - last)
+                return await interaction.response.send_message(
+                    f"⏳ Cooldown actif ({remaining}s restantes).",
+                    ephemeral=True
+                )
 
-        mentions = " ".join(m.mention for m in targets)
+            targets = find_missing_voters(interaction.guild, poll)
 
-        await interaction.channel.send(
-            f"📣 **Rappel sondage** — merci de voter :\n{mentions}"
-        )
+            if not targets:
+                return await interaction.response.send_message(
+                    "✅ Tout le monde a voté.",
+                    ephemeral=True
+                )
 
-        poll["last_notify_ts"] = now
-        save_poll(poll)
+            # cooldown consommé sous verrou : deux clics ne notifient qu'une fois
+            poll["last_notify_ts"] = now
 
+        # réponse immédiate (fenêtre de 3s), le bilan suit en édition
         await interaction.response.send_message(
-            "📨 Absents notifiés.",
+            f"📣 **Notification en cours…** {len(targets)} absent(s)",
             ephemeral=True
         )
-class PollMultiVoteButton(discord.ui.Button):
+
+        report = await ANNOUNCER.send(
+            interaction.channel,
+            "📣 **Rappel sondage** — merci de voter :",
+            [m.mention for m in targets]
+        )
+
+        try:
+            await interaction.edit_original_response(content=report.render())
+        except Exception as e:
+            module_log("polls", f"notify report update failed: {e}", "ERROR")
+class PollMultiVoteButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"poll_multivote:(?P<poll_id>[^:]+)"
+):
     def __init__(self, poll: dict):
         label = "🔁 Multi-vote : ON" if poll.get("multiple", False) else "🔁 Multi-vote : OFF"
         style = discord.ButtonStyle.success if poll.get("multiple", False) else discord.ButtonStyle.secondary
 
         super().__init__(
-            label=label,
-            style=style,
-            custom_id=f"poll_multivote:{poll['poll_id']}"
+            discord.ui.Button(
+                label=label,
+                style=style,
+                custom_id=f"poll_multivote:{poll['poll_id']}"
+            )
         )
 
         self.poll_id = poll["poll_id"]
 
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls({"poll_id": match["poll_id"]})
+
     async def callback(self, interaction: discord.Interaction):
-        poll = load_poll(self.poll_id)
-        if not poll or poll["status"] != "open":
-            return await interaction.response.send_message(
-                "❌ Sondage fermé",
-                ephemeral=True
-            )
+        async with poll_transaction(self.poll_id) as poll:
+            if not poll or poll["status"] != "open":
+                return await interaction.response.send_message(
+                    "❌ Sondage fermé",
+                    ephemeral=True
+                )
 
-        if interaction.user.id != poll["created_by"]:
-            return await interaction.response.send_message(
-                "❌ Réservé au créateur",
-                ephemeral=True
-            )
+            if interaction.user.id != poll["created_by"]:
+                return await interaction.response.send_message(
+                    "❌ Réservé au créateur",
+                    ephemeral=True
+                )
 
-        poll["multiple"] = not poll.get("multiple", False)
-        save_poll(poll)
+            poll["multiple"] = not poll.get("multiple", False)
 
-        await interaction.message.edit(
-            embed=build_poll_embed(poll),
-            view=PollView(poll)
-        )
+        REFRESHER.request(interaction.client, self.poll_id)
 
         await interaction.response.send_message(
             f"🔁 Multi-vote {'activé' if poll['multiple'] else 'désactivé'}",
             ephemeral=True
         )
-class PollMpAbsentsButton(discord.ui.Button):
+class PollMpAbsentsButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"poll_mp_absents:(?P<poll_id>[^:]+)"
+):
     def __init__(self, poll: dict):
         super().__init__(
-            label="MP",
-            emoji="✉️",
-            style=discord.ButtonStyle.secondary,
-            custom_id=f"poll_mp_absents:{poll['poll_id']}"
+            discord.ui.Button(
+                label="MP",
+                emoji="✉️",
+                style=discord.ButtonStyle.secondary,
+                custom_id=f"poll_mp_absents:{poll['poll_id']}"
+            )
         )
         self.poll_id = poll["poll_id"]
 
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls({"poll_id": match["poll_id"]})
+
     async def callback(self, interaction: discord.Interaction):
         await interaction.response.send_modal(
             PollMpAbsentsModal(self.poll_id)
         )
 
 class PollMpPreviewView(discord.ui.View):
-    def __init__(self, poll_id: str, message: str):
+    def __init__(self, poll_id: str, message: str, user_ids: tuple[int, ...]):
         super().__init__(timeout=300)  # 5 min
         self.poll_id = poll_id
         self.message = message
+        # destinataires figés à l'aperçu : la confirmation envoie à ce set exact
+        self.user_ids = user_ids
 
     @discord.ui.button(label="✅ Envoyer", style=discord.ButtonStyle.success)
     async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button):
-        poll = load_poll(self.poll_id)
-        if not poll or poll["status"] != "open":
-            return await interaction.response.send_message(
-                "❌ Sondage fermé ou introuvable.",
-                ephemeral=True
-            )
-
-        # 🔐 mêmes permissions
-        member = interaction.guild.get_member(interaction.user.id)
-        is_admin = any(r.id in config.ADMIN_ROLE_IDS for r in member.roles)
-
-        if interaction.user.id != poll["created_by"] and not is_admin:
-            return await interaction.response.send_message(
-                "❌ Action non autorisée.",
-                ephemeral=True
-            )
-
-        # ⏱️ même cooldown
-        now = int(time.time())
-        last = poll.get("last_notify_ts", 0)
-        cooldown = getattr(config, "POLL_NOTIFY_COOLDOWN_SECONDS", 600)
-
-        if now - last < cooldown:
-            remaining = cooldown - (now - last)
-            return await interaction.response.send_message(
-                f"⏳ Cooldown actif ({remaining}s restantes).",
-                ephemeral=True
-            )
-
-        # 🎯 CIBLAGE — STRICTEMENT IDENTIQUE
-        voters = set(poll["votes"].keys())
-        targets = [
-            m for m in interaction.guild.members
-            if any(r.id in poll.get("notify_roles", []) for r in m.roles)
-            and str(m.id) not in voters
-            and not m.bot
-        ]
-
-        if not targets:
-            return await interaction.response.send_message(
-                "✅ Tout le monde a voté.",
-                ephemeral=True
-            )
+        async with poll_transaction(self.poll_id) as poll:
+            if not poll or poll["status"] != "open":
+                return await interaction.response.send_message(
+                    "❌ Sondage fermé ou introuvable.",
+                    ephemeral=True
+                )
+
+            # 🔐 mêmes permissions
+            member = interaction.guild.get_member(interaction.user.id)
+            is_admin = any(r.id in config.ADMIN_ROLE_IDS for r in member.roles)
+
+            if interaction.user.id != poll["created_by"] and not is_admin:
+                return await interaction.response.send_message(
+                    "❌ Action non autorisée.",
+                    ephemeral=True
+                )
+
+            # ⏱️ même cooldown
+            now = int(time.time())
+            last = poll.get("last_notify_ts", 0)
+            cooldown = getattr(config, "POLL_NOTIFY_COOLDOWN_SECONDS", 600)
+
+            if now - last < cooldown:
+                remaining = cooldown - (now - last)
+                return await interaction.response.send_message(
+                    f"⏳ Cooldown actif ({remaining}s restantes).",
+                    ephemeral=True
+                )
+
+            # 🎯 CIBLAGE — le set prévisualisé, sans recalcul,
+            # moins les membres partis depuis l'aperçu
+            guild = interaction.guild
+            targets = [uid for uid in self.user_ids if guild.get_member(uid)]
+
+            if not targets:
+                return await interaction.response.send_message(
+                    "✅ Tout le monde a voté.",
+                    ephemeral=True
+                )
+
+            poll["last_notify_ts"] = now
 
         poll_link = (
             f"https://discord.com/channels/"
@@ -345,28 +428,27 @@ class PollMpPreviewView(discord.ui.View):
             f"{self.message}"
         )
 
-        sent = 0
-        failed = 0
+        # réponse immédiate (fenêtre de 3s), la progression suit en édition
+        await interaction.response.send_message(
+            f"✉️ **Envoi en cours…** 0/{len(targets)}",
+            ephemeral=True
+        )
 
-        for m in targets:
-            try:
-                await m.send(content)
-                sent += 1
-            except Exception:
-                failed += 1
+        async def progress(report):
+            await interaction.edit_original_response(content=report.render())
 
-        poll["last_notify_ts"] = now
-        save_poll(poll)
+        report = await DISPATCHER.start_job(
+            interaction.client,
+            poll["poll_id"],
+            targets,
+            content,
+            progress=progress
+        )
 
         module_log(
             "polls",
-            f"MP absents sent={sent} failed={failed} poll={poll['poll_id']}"
-        )
-
-        await interaction.response.send_message(
-            f"✉️ **Messages envoyés** : {sent}\n"
-            f"❌ **Échecs** : {failed}",
-            ephemeral=True
+            f"MP absents queued job={report.job_id} "
+            f"targets={report.total} poll={poll['poll_id']}"
         )
 
         self.stop()
@@ -392,41 +474,32 @@ class PollDurationModal(discord.ui.Modal, title="⏱️ Durée du sondage (jours
         self.poll_id = poll_id
 
     async def on_submit(self, interaction: discord.Interaction):
-        poll = load_poll(self.poll_id)
-        if not poll or poll["status"] != "open":
-            return await interaction.response.send_message(
-                "❌ Sondage fermé", ephemeral=True
-            )
-
-        days = int(self.days.value)
-        minutes = days * 1440
-        poll["duration_minutes"] = minutes
-        poll["ends_at"] = (
-            datetime.datetime.utcnow()
-            + datetime.timedelta(minutes=minutes)
-        ).isoformat()
-        poll["alert_sent"] = False
-        save_poll(poll)
+        async with poll_transaction(self.poll_id) as poll:
+            if not poll or poll["status"] != "open":
+                return await interaction.response.send_message(
+                    "❌ Sondage fermé", ephemeral=True
+                )
+
+            days = int(self.days.value)
+            minutes = days * 1440
+            poll["duration_minutes"] = minutes
+            poll["ends_at"] = (
+                datetime.datetime.utcnow()
+                + datetime.timedelta(minutes=minutes)
+            ).isoformat()
+            poll["alert_sent"] = False
 
         client = interaction.client
         pid = poll["poll_id"]
 
-        safe_create_task(auto_close_poll(client, pid), f"auto_close:{pid}")
-        safe_create_task(alert_unvoted_members(client, pid), f"alert:{pid}")
-        safe_create_task(
-            auto_update_poll_timer(client, pid, 1),
-            f"refresh:{pid}"
-        )
+        schedule_poll_jobs(poll)
 
         await interaction.response.send_message(
             f"⏱️ Durée mise à jour : **{days} jour(s)**",
             ephemeral=True
         )
 
-        await interaction.message.edit(
-            embed=build_poll_embed(poll),
-            view=PollView(poll)
-        )
+        REFRESHER.request(client, pid)
 
 
 class PollMpAbsentsModal(discord.ui.Modal):
@@ -444,7 +517,7 @@ class PollMpAbsentsModal(discord.ui.Modal):
         self.add_item(self.message)
 
     async def on_submit(self, interaction: discord.Interaction):
-        poll = load_poll(self.poll_id)
+        poll = await load_poll_async(self.poll_id)
         if not poll or poll["status"] != "open":
             return await interaction.response.send_message(
                 "❌ Sondage fermé ou introuvable.",
@@ -473,14 +546,8 @@ class PollMpAbsentsModal(discord.ui.Modal):
                 ephemeral=True
             )
 
-        # 🎯 CIBLAGE — COPIÉ STRICTEMENT DU BOUTON EXISTANT
-        voters = set(poll["votes"].keys())
-        targets = [
-            m for m in interaction.guild.members
-            if any(r.id in poll.get("notify_roles", []) for r in m.roles)
-            and str(m.id) not in voters
-            and not m.bot
-        ]
+        # 🎯 CIBLAGE — snapshot partagé avec le bouton Notifier absents
+        targets = ABSENTEES.get(interaction.guild, poll).user_ids
 
         if not targets:
             return await interaction.response.send_message(
@@ -508,7 +575,7 @@ class PollMpAbsentsModal(discord.ui.Modal):
 
         await interaction.response.send_message(
             preview,
-            view=PollMpPreviewView(self.poll_id, self.message.value),
+            view=PollMpPreviewView(self.poll_id, self.message.value, targets),
             ephemeral=True
         )
 
@@ -527,3 +594,23 @@ class PollView(discord.ui.View):
             self.add_item(PollMultiVoteButton(poll))
             self.add_item(PollNotifyAbsentsButton(poll))
             self.add_item(PollMpAbsentsButton(poll))
+
+
+# =========================
+# ROUTER
+# =========================
+POLL_DYNAMIC_ITEMS = (
+    PollButton,
+    PollTimerButton,
+    PollMultiVoteButton,
+    PollNotifyAbsentsButton,
+    PollMpAbsentsButton,
+)
+
+
+def register_poll_router(bot):
+    """
+    Enregistre une seule fois les routes poll_vote:/poll_timer:/… :
+    tous les sondages ouverts sont servis sans vue résidente.
+    """
+    bot.add_dynamic_items(*POLL_DYNAMIC_ITEMS)
@@ -1,13 +1,13 @@
-def split_message(text: str, limit: int = 1900):
+def split_message(text: str, limit: int = 1900, sep: str = "\n"):
     chunks = []
     current = ""
 
-    for line in text.split("\n"):
-        if len(current) + len(line) + 1 > limit:
+    for line in text.split(sep):
+        if current and len(current) + len(line) + len(sep) > limit:
             chunks.append(current)
             current = line
         else:
-            current += ("\n" if current else "") + line
+            current += (sep if current else "") + line
 
     if current:
         chunks.append(current)
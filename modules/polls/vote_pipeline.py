@@ -0,0 +1,184 @@
+import asyncio
+
+from core.logger import log
+from core.metrics import METRICS
+from modules.polls import polls_db
+
+_STOP = object()
+
+# plafond du délai entre deux réessais d'un lot en échec
+RETRY_MAX_S = 5.0
+
+# =========================
+# VOTE PIPELINE (group commit)
+# =========================
+class VotePipeline:
+    """
+    File asyncio des écritures de votes.
+
+    Les clics sont acquittés dès l'enqueue ; un consommateur unique
+    fusionne les opérations en attente (un ajout puis un retrait du même
+    vote s'annulent) et les applique en une transaction toutes les
+    `batch_ms` millisecondes ou tous les `batch_size` événements.
+    Un lot en échec est remis en attente et réessayé avec un délai
+    croissant, fusionné avec les clics arrivés entre-temps.
+    """
+
+    def __init__(self, batch_ms: int = 50, batch_size: int = 500):
+        self.batch_ms = batch_ms
+        self.batch_size = batch_size
+
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        # (poll_id, user_id, option) -> "added" | "removed"
+        self._pending: dict[tuple, str] = {}
+        self._failures = 0
+        self._retry_at = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def depth(self) -> int:
+        # file + ops fusionnées en attente (dont un lot en échec à réessayer)
+        queued = self._queue.qsize() if self.running else 0
+        return queued + len(self._pending)
+
+    def start(self, batch_ms: int | None = None, batch_size: int | None = None):
+        if self.running:
+            return
+
+        if batch_ms is not None:
+            self.batch_ms = batch_ms
+        if batch_size is not None:
+            self.batch_size = batch_size
+
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def enqueue(self, poll_id: str, user_id: int, option: str, action: str):
+        if not self.running:
+            # pas de boucle (scripts, arrêt) → écriture directe
+            polls_db.submit_vote(poll_id, user_id, option, action)
+            return
+
+        self._queue.put_nowait((poll_id, user_id, option, action))
+
+    async def stop(self):
+        if not self.running:
+            return
+
+        self._queue.put_nowait(_STOP)
+        await self._task
+        self._task = None
+
+    # =========================
+    # CONSUMER
+    # =========================
+    def _merge(self, op):
+        poll_id, user_id, option, action = op
+        key = (poll_id, user_id, option)
+
+        previous = self._pending.get(key)
+        if previous and previous != action:
+            del self._pending[key]
+        else:
+            self._pending[key] = action
+
+    def _requeue(self, ops):
+        # ops plus anciennes que celles en attente : la fusion est
+        # symétrique (ajout + retrait s'annulent), l'ordre importe peu
+        for op in ops:
+            self._merge(op)
+
+        self._failures += 1
+        delay = min(RETRY_MAX_S, self.batch_ms / 1000 * 2 ** self._failures)
+        self._retry_at = asyncio.get_running_loop().time() + delay
+        return delay
+
+    async def _flush(self, force: bool = False):
+        if not self._pending:
+            return
+        if not force and asyncio.get_running_loop().time() < self._retry_at:
+            return
+
+        ops = [
+            (poll_id, user_id, option, action)
+            for (poll_id, user_id, option), action in self._pending.items()
+        ]
+        self._pending = {}
+
+        try:
+            await polls_db.apply_vote_batch_async(ops)
+        except Exception as e:
+            delay = self._requeue(ops)
+            log(
+                f"POLL vote batch failed ({len(ops)} op(s)), "
+                f"retry in {delay:.2f}s: {e}",
+                "ERROR"
+            )
+            return
+
+        self._failures = 0
+        self._retry_at = 0.0
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        stopping = False
+
+        while not stopping:
+            if self._pending:
+                # lot en échec : réessai à l'échéance, même sans nouveau clic
+                try:
+                    op = await asyncio.wait_for(
+                        self._queue.get(),
+                        max(0.0, self._retry_at - loop.time())
+                    )
+                except asyncio.TimeoutError:
+                    await self._flush()
+                    continue
+            else:
+                op = await self._queue.get()
+
+            if op is _STOP:
+                break
+
+            self._merge(op)
+            events = 1
+            deadline = loop.time() + self.batch_ms / 1000
+
+            while events < self.batch_size:
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        op = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    op = self._queue.get_nowait()
+
+                if op is _STOP:
+                    stopping = True
+                    break
+
+                self._merge(op)
+                events += 1
+
+            await self._flush()
+
+        # arrêt : dernière tentative sans attendre l'échéance
+        await self._flush(force=True)
+        if self._pending:
+            log(f"POLL vote pipeline stopped with {len(self._pending)} unsaved op(s)", "ERROR")
+
+
+PIPELINE = VotePipeline()
+
+METRICS.gauge(
+    "poll_vote_queue_depth",
+    "Écritures de votes en attente de group commit"
+).set_function(lambda: PIPELINE.depth)
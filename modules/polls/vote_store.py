@@ -0,0 +1,232 @@
+import itertools
+import struct
+import sys
+
+from array import array
+from bisect import bisect_left
+
+# =========================
+# VOTE STORE (compact)
+# =========================
+# Représentation mémoire des votes d'un sondage :
+#   _users  : array('Q') trié des user_id (recherche par bisect)
+#   _masks  : array('Q') parallèle, bit i = option d'indice i choisie
+#   _counts : array('Q') compteurs par option, maintenus à chaque vote
+# Soit 16 octets par votant, au lieu d'une clé str + une liste de labels.
+#
+# Format binaire (archives) : en-tête, compteurs, puis les deux colonnes
+# brutes, little-endian. Les labels restent dans les métadonnées du sondage.
+
+MAGIC = b"FFV1"
+MAX_OPTIONS = 64
+
+_HEADER = struct.Struct("<4sHI")  # magic, nb d'options, nb de votants
+
+# Versions uniques tous stores confondus : un store rechargé depuis SQLite
+# ne reprend jamais la version d'un snapshot calculé sur l'ancien.
+_VERSIONS = itertools.count(1)
+
+
+class VoteStore:
+    __slots__ = ("options", "_index", "_users", "_masks", "_counts", "version")
+
+    def __init__(self, options: list[str]):
+        if len(options) > MAX_OPTIONS:
+            raise ValueError(f"{len(options)} options (max {MAX_OPTIONS})")
+
+        self.options = list(options)
+        self._index = {opt: i for i, opt in enumerate(self.options)}
+        self._users = array("Q")
+        self._masks = array("Q")
+        self._counts = array("Q", [0] * len(self.options))
+        # change à chaque arrivée ou départ d'un votant
+        self.version = next(_VERSIONS)
+
+    # =========================
+    # LECTURE
+    # =========================
+    def __len__(self) -> int:
+        return len(self._users)
+
+    @property
+    def voter_count(self) -> int:
+        return len(self._users)
+
+    def _find(self, user_id: int) -> tuple[int, bool]:
+        pos = bisect_left(self._users, user_id)
+        return pos, pos < len(self._users) and self._users[pos] == user_id
+
+    def __contains__(self, user_id: int) -> bool:
+        return self._find(int(user_id))[1]
+
+    def has_option(self, option: str) -> bool:
+        return option in self._index
+
+    def _labels(self, mask: int) -> list[str]:
+        return [opt for i, opt in enumerate(self.options) if mask >> i & 1]
+
+    def options_of(self, user_id: int) -> list[str]:
+        pos, found = self._find(int(user_id))
+        return self._labels(self._masks[pos]) if found else []
+
+    def user_ids(self):
+        return iter(self._users)
+
+    def items(self):
+        """
+        (user_id, [option, ...]) par votant, dans l'ordre des user_id.
+        """
+        for user_id, mask in zip(self._users, self._masks):
+            yield user_id, self._labels(mask)
+
+    def counts(self) -> dict:
+        return dict(zip(self.options, self._counts))
+
+    def voters_by_option(self) -> dict:
+        result = {opt: [] for opt in self.options}
+        for user_id, mask in zip(self._users, self._masks):
+            for i, opt in enumerate(self.options):
+                if mask >> i & 1:
+                    result[opt].append(user_id)
+        return result
+
+    # =========================
+    # ÉCRITURE
+    # =========================
+    def _set(self, user_id: int, mask: int) -> int:
+        """
+        Remplace le masque du votant, met à jour les compteurs et
+        retourne l'ancien masque. Un masque vide retire le votant.
+        """
+        pos, found = self._find(user_id)
+        old = self._masks[pos] if found else 0
+
+        changed = old ^ mask
+        i = 0
+        while changed:
+            if changed & 1:
+                self._counts[i] += 1 if mask >> i & 1 else -1
+            changed >>= 1
+            i += 1
+
+        if mask and found:
+            self._masks[pos] = mask
+        elif mask:
+            self._users.insert(pos, user_id)
+            self._masks.insert(pos, mask)
+            self.version = next(_VERSIONS)
+        elif found:
+            del self._users[pos]
+            del self._masks[pos]
+            self.version = next(_VERSIONS)
+
+        return old
+
+    def toggle(self, user_id: int, option: str) -> str:
+        """
+        Vote multiple : ajoute ou retire une option.
+        """
+        bit = 1 << self._index[option]
+        user_id = int(user_id)
+        old = self._set(user_id, self._mask_of(user_id) ^ bit)
+        return "removed" if old & bit else "added"
+
+    def choose(self, user_id: int, option: str) -> tuple[str, list[str]]:
+        """
+        Vote unique : même option → retrait, sinon remplacement.
+        Retourne (action, options retirées). Un votant peut en détenir
+        plusieurs si le sondage vient de repasser en choix unique.
+        """
+        bit = 1 << self._index[option]
+        user_id = int(user_id)
+        old = self._mask_of(user_id)
+
+        if old == bit:
+            self._set(user_id, 0)
+            return "removed", []
+
+        self._set(user_id, bit)
+        return "added", self._labels(old & ~bit)
+
+    def _mask_of(self, user_id: int) -> int:
+        pos, found = self._find(user_id)
+        return self._masks[pos] if found else 0
+
+    # =========================
+    # CONSTRUCTION / COHÉRENCE
+    # =========================
+    @classmethod
+    def from_rows(cls, options: list[str], rows) -> "VoteStore":
+        """
+        Construit le store depuis des lignes (user_id, option) en O(n log n).
+        Les options inconnues sont ignorées.
+        """
+        store = cls(options)
+        masks: dict[int, int] = {}
+
+        for user_id, option in rows:
+            i = store._index.get(option)
+            if i is not None:
+                user_id = int(user_id)
+                masks[user_id] = masks.get(user_id, 0) | 1 << i
+
+        users = sorted(masks)
+        store._users = array("Q", users)
+        store._masks = array("Q", [masks[u] for u in users])
+        store._counts = store.recount()
+        return store
+
+    def recount(self) -> array:
+        counts = array("Q", [0] * len(self.options))
+        for mask in self._masks:
+            i = 0
+            while mask:
+                if mask & 1:
+                    counts[i] += 1
+                mask >>= 1
+                i += 1
+        return counts
+
+    def check(self, repair: bool = True) -> bool:
+        """
+        Vérifie les compteurs contre les masques ; les reconstruit si besoin.
+        """
+        counts = self.recount()
+        ok = counts == self._counts
+        if not ok and repair:
+            self._counts = counts
+        return ok
+
+    # =========================
+    # SÉRIALISATION
+    # =========================
+    def to_bytes(self) -> bytes:
+        columns = [self._counts, self._users, self._masks]
+        if sys.byteorder != "little":
+            columns = [array("Q", c) for c in columns]
+            for c in columns:
+                c.byteswap()
+
+        header = _HEADER.pack(MAGIC, len(self.options), len(self._users))
+        return header + b"".join(c.tobytes() for c in columns)
+
+    @classmethod
+    def from_bytes(cls, options: list[str], data: bytes) -> "VoteStore":
+        magic, n_options, n = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("format de votes inconnu")
+        if n_options != len(options):
+            raise ValueError("options incohérentes avec les votes")
+
+        store = cls(options)
+        columns = [array("Q"), store._users, store._masks]
+
+        offset = _HEADER.size
+        for column, count in zip(columns, (n_options, n, n)):
+            column.frombytes(data[offset:offset + count * 8])
+            offset += count * 8
+            if sys.byteorder != "little":
+                column.byteswap()
+
+        store._counts = columns[0]
+        return store